@@ -0,0 +1,85 @@
+from __future__ import annotations
+from typing import Optional, Sequence
+
+from feedback import FeedbackMatrix, decode_pattern
+from support import WORD_LENGTH
+
+
+def partition(
+    matrix: FeedbackMatrix,
+    guess: str,
+    remaining: Sequence[int]
+) -> dict[int, list[int]]:
+    """ Groups answer columns by the feedback guess would get against them.
+
+    Reads one precomputed row of the feedback matrix, so no guess is scored
+    at play time.
+
+    Parameters:
+        matrix: The feedback matrix
+        guess: A vocab word
+        remaining: Answer columns to group
+
+    Returns:
+        Map of pattern code to the columns giving that pattern, in order
+    """
+    row = matrix.row(guess)
+    buckets = {}
+    for j in remaining:
+        code = row[j]
+        bucket = buckets.get(code)
+        if bucket is None:
+            buckets[code] = [j]
+        else:
+            bucket.append(j)
+    return buckets
+
+
+class AdversarialGame:
+    """ A game whose answer is never fixed up front.
+
+        After each guess it answers with the feedback shared by the most
+        remaining answers and keeps only those, so the player only wins once
+        no other answer is left to hide behind.
+    """
+    def __init__(
+        self,
+        matrix: FeedbackMatrix,
+        length: int = WORD_LENGTH
+    ) -> None:
+        """ Starts with every answer in the matrix still possible.
+
+        Parameters:
+            matrix: The feedback matrix for the vocab and answers
+            length: Number of letters in a word
+        """
+        self._matrix = matrix
+        self._length = length
+        self._win_code = 3 ** length - 1
+        self._remaining = list(range(len(matrix.get_answers())))
+
+    def respond(self, guess: str) -> str:
+        """ Returns the processed form of guess, narrowing the answers to the
+            largest group that shares it.
+
+        Ties go to the pattern that is not a win, then to the pattern with
+        the lowest code (the one revealing least).
+        """
+        buckets = partition(self._matrix, guess, self._remaining)
+        code = max(buckets, key=lambda code: (len(buckets[code]),
+                                               code != self._win_code, -code))
+        self._remaining = buckets[code]
+        return decode_pattern(code, self._length)
+
+    def get_remaining(self) -> list[str]:
+        """ Returns the answers still consistent with every response. """
+        answers = self._matrix.get_answers()
+        return [answers[j] for j in self._remaining]
+
+    def get_answer(self) -> Optional[str]:
+        """ Returns an answer consistent with every response so far (the
+            answer, once the player has won).
+        """
+        if not self._remaining:
+            return None
+        return self._matrix.get_answers()[self._remaining[0]]
@@ -0,0 +1,123 @@
+from __future__ import annotations
+from array import array
+from typing import Optional, Sequence
+
+from history import GuessHistory
+from support import cached_for
+from word_index import get_index
+from word_store import WordStore
+
+COMPLETIONS = 5
+
+
+class Trie:
+    """ A prefix tree over a word list for autocomplete.
+
+        Nodes are numbered, with their children in small dicts. Since the
+        words are inserted in alphabetical order, the words under a node are
+        one run of that order, so each node only stores where its run starts
+        and ends (in two flat arrays) and never a copy of the words.
+    """
+    def __init__(self, words: Sequence[str]) -> None:
+        """ Builds the trie over words.
+
+        Parameters:
+            words: The words to complete; a WordStore's stored alphabetical
+                   order is used as is
+        """
+        self._words = words
+        if isinstance(words, WordStore):
+            self._order = array('I', words.get_order())
+        else:
+            self._order = array('I', sorted(range(len(words)),
+                                            key=words.__getitem__))
+        self._children = [{}]
+        self._start = array('I', [0])
+        self._end = array('I', [len(self._order)])
+        for position, i in enumerate(self._order):
+            node = 0
+            for letter in words[i]:
+                child = self._children[node].get(letter)
+                if child is None:
+                    child = self._children[node][letter] = len(self._children)
+                    self._children.append({})
+                    self._start.append(position)
+                    self._end.append(position)
+                self._end[child] = position + 1
+                node = child
+
+    def get_words(self) -> Sequence[str]:
+        """ Returns the words this trie was built over. """
+        return self._words
+
+    def complete(
+        self,
+        prefix: str,
+        count: int = COMPLETIONS,
+        mask: Optional[int] = None
+    ) -> list[str]:
+        """ Returns up to count words starting with prefix, alphabetically.
+
+        Parameters:
+            prefix: What has been typed so far
+            count: Most completions to return
+            mask: If given, only words whose bit is set (by word number, as in
+                  a WordIndex mask) are returned
+        """
+        node = 0
+        for letter in prefix:
+            node = self._children[node].get(letter)
+            if node is None:
+                return []
+        # Shifting a big int is linear in its size, so test bits in bytes
+        bits = None
+        if mask is not None:
+            bits = mask.to_bytes((len(self._order) + 7) // 8, 'little')
+        found = []
+        for position in range(self._start[node], self._end[node]):
+            i = self._order[position]
+            if bits is not None and not bits[i >> 3] >> (i & 7) & 1:
+                continue
+            word = self._words[i]
+            if not found or found[-1] != word:
+                found.append(word)
+                if len(found) == count:
+                    break
+        return found
+
+    def __len__(self) -> int:
+        """ Returns the number of nodes, including the root. """
+        return len(self._children)
+
+    def __repr__(self) -> str:
+        """ Returns the computer representation of this trie. """
+        return f"Trie({len(self._order)} words, {len(self)} nodes)"
+
+
+_tries = {}
+
+def get_trie(words: Sequence[str]) -> Trie:
+    """ Returns the trie for words, building it the first time a given word
+        list is seen.
+    """
+    return cached_for(_tries, words, Trie)
+
+def complete(
+    words: Sequence[str],
+    prefix: str,
+    history: Optional[GuessHistory] = None,
+    count: int = COMPLETIONS
+) -> list[str]:
+    """ Returns up to count guesses from words starting with prefix.
+
+    Parameters:
+        words: The valid guesses
+        prefix: What has been typed so far
+        history: If given (hard mode), only words consistent with every clue
+                 in it, using the same bitset index as guess_next
+        count: Most completions to return
+    """
+    mask = None
+    if history is not None:
+        mask = get_index(words).compile(history)
+    return get_trie(words).complete(prefix.lower(), count, mask)
@@ -0,0 +1,194 @@
+from __future__ import annotations
+import os
+import struct
+from typing import Optional, Sequence
+
+from preorder import read_node, write_node
+from support import cached_for, word_checksum
+
+TREE_SUFFIX = '.bkt'
+MAGIC = b'BKTR'
+FORMAT_VERSION = 1
+# magic, version, #words, checksum of the words
+HEADER = struct.Struct('<4sHII')
+# word number, number of children
+NODE = struct.Struct('<IB')
+# edit distance to a child
+EDGE = struct.Struct('<B')
+# Furthest a suggestion may be from the word typed
+MAX_DISTANCE = 2
+SUGGESTIONS = 3
+
+# A node is (word number, {edit distance: child node})
+Node = tuple[int, dict[int, 'Node']]
+
+
+def _letter_masks(word: str) -> dict[str, int]:
+    """ Returns, for each letter of word, the bitset of its positions. """
+    masks = {}
+    for i, letter in enumerate(word):
+        masks[letter] = masks.get(letter, 0) | 1 << i
+    return masks
+
+def _distance(masks: dict[str, int], length: int, other: str) -> int:
+    """ Returns the edit distance from the word described by masks (as made
+        by _letter_masks) and length to other.
+
+    Uses Myers' bit-parallel algorithm: a whole column of the edit distance
+    table is held as bitsets of +1 / -1 steps, so each letter of other costs
+    a few integer operations instead of a row of comparisons.
+    """
+    if not length:
+        return len(other)
+    full = (1 << length) - 1
+    top = 1 << (length - 1)
+    plus, minus = full, 0
+    score = length
+    for letter in other:
+        equal = masks.get(letter, 0)
+        across = equal | minus
+        down = (((equal & plus) + plus) ^ plus) | equal
+        up_h = minus | (~(down | plus) & full)
+        down_h = plus & down
+        if up_h & top:
+            score += 1
+        elif down_h & top:
+            score -= 1
+        up_h = ((up_h << 1) | 1) & full
+        down_h = (down_h << 1) & full
+        plus = down_h | (~(across | up_h) & full)
+        minus = up_h & across
+    return score
+
+def edit_distance(a: str, b: str) -> int:
+    """ Returns the Levenshtein distance between a and b: the fewest letters
+        inserted, deleted or replaced to turn one into the other.
+    """
+    return _distance(_letter_masks(a), len(a), b)
+
+
+class BKTree:
+    """ A metric tree over a word list for near-miss lookups.
+
+        Every child of a node sits at a fixed edit distance from it, so by the
+        triangle inequality a search within distance d of a word only visits
+        children whose edge is within d of the node's own distance, and most
+        of the word list is never compared.
+    """
+    def __init__(
+        self,
+        words: Sequence[str],
+        root: Optional[Node] = None
+    ) -> None:
+        """ Builds the tree over words, unless a built root is given.
+
+        Parameters:
+            words: The words to index
+            root: A tree previously built over words, as read by load_tree
+        """
+        self._words = words
+        # Decoded once; a WordStore decodes on every access
+        self._list = tuple(words)
+        self._root = root
+        if root is not None or not words:
+            return
+        self._root = (0, {})
+        for i in range(1, len(self._list)):
+            masks = _letter_masks(self._list[i])
+            length = len(self._list[i])
+            node = self._root
+            while True:
+                distance = _distance(masks, length, self._list[node[0]])
+                if distance == 0:
+                    break  # a repeated word
+                child = node[1].get(distance)
+                if child is None:
+                    node[1][distance] = (i, {})
+                    break
+                node = child
+
+    def get_words(self) -> Sequence[str]:
+        """ Returns the words this tree was built over. """
+        return self._words
+
+    def within(self, word: str, max_distance: int) -> list[tuple[int, str]]:
+        """ Returns (distance, word) for every word within max_distance of
+            word, closest first, ties in word list order.
+        """
+        masks = _letter_masks(word)
+        found = []
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            i, children = stack.pop()
+            distance = _distance(masks, len(word), self._list[i])
+            if distance <= max_distance:
+                found.append((distance, i))
+            for edge, child in children.items():
+                if distance - max_distance <= edge <= distance + max_distance:
+                    stack.append(child)
+        return [(distance, self._list[i]) for distance, i in sorted(found)]
+
+    def suggest(
+        self,
+        word: str,
+        count: int = SUGGESTIONS,
+        max_distance: int = MAX_DISTANCE
+    ) -> list[str]:
+        """ Returns up to count words closest to word, none further than
+            max_distance, leaving out word itself.
+
+        The search radius grows one step at a time and stops once count
+        words are found, since a small radius prunes far more of the tree.
+        """
+        found = []
+        for radius in range(1, max_distance + 1):
+            found = [match for _, match in self.within(word, radius)
+                     if match != word]
+            if len(found) >= count:
+                break
+        return found[:count]
+
+    def save(self, filename: str) -> None:
+        """ Writes the tree in preorder: per node its word number and child
+            count, then each child's distance followed by the child.
+        """
+        out = [HEADER.pack(MAGIC, FORMAT_VERSION, len(self._words),
+                           word_checksum(self._words))]
+        if self._root is not None:
+            write_node(self._root, out, NODE, EDGE)
+        temp_name = filename + '.tmp'
+        with open(temp_name, 'wb') as file:
+            file.write(b''.join(out))
+        os.replace(temp_name, filename)
+
+
+def tree_name(filename: str) -> str:
+    """ Returns the saved tree path for a text word list. """
+    return os.path.splitext(filename)[0] + TREE_SUFFIX
+
+def load_tree(words: Sequence[str], filename: str) -> BKTree:
+    """ Returns the tree for words, read from filename if it was saved for
+        the same words, or else built and saved there.
+    """
+    try:
+        with open(filename, 'rb') as file:
+            data = file.read()
+    except OSError:
+        data = b''
+    if len(data) > HEADER.size and HEADER.unpack_from(data) == (
+            MAGIC, FORMAT_VERSION, len(words), word_checksum(words)):
+        return BKTree(words, read_node(data, HEADER.size, NODE, EDGE)[0])
+    tree = BKTree(words)
+    tree.save(filename)
+    return tree
+
+
+_trees = {}
+
+def get_tree(words: Sequence[str]) -> BKTree:
+    """ Returns the tree for words, building it the first time a given word
+        list is seen. The tree of a WordStore is also saved next to its file,
+        so later runs read it instead of building it.
+    """
+    return cached_for(_trees, words, BKTree, lambda store: load_tree(
+        store, tree_name(store.get_filename())))
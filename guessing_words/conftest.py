@@ -0,0 +1,27 @@
+from __future__ import annotations
+import os
+from random import Random
+
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+# Vocab words sampled into the small word lists the tests build files from
+SAMPLE_SIZE = 400
+
+
+def _read(filename: str) -> list[str]:
+    """ Returns the words of one of the shipped word lists. """
+    with open(os.path.join(HERE, filename)) as file:
+        return [line.strip() for line in file]
+
+
+@pytest.fixture(scope='session')
+def answers() -> list[str]:
+    """ The shipped answers. """
+    return _read('answers.txt')
+
+@pytest.fixture(scope='session')
+def vocab(answers: list[str]) -> list[str]:
+    """ A seeded sample of the shipped vocab, with every answer in it. """
+    words = Random(1).sample(_read('vocab.txt'), SAMPLE_SIZE)
+    return sorted(set(words) | set(answers))
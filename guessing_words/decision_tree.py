@@ -0,0 +1,195 @@
+from __future__ import annotations
+import argparse
+import os
+import struct
+import sys
+import time
+from typing import Optional, Sequence
+
+from feedback import (
+    FeedbackMatrix,
+    encode_pattern,
+    matrix_pool,
+    worker_matrix,
+)
+from adversary import partition
+from preorder import read_node, write_node
+from solver import best_in
+from support import (
+    DECISION_TREE_FILE,
+    FEEDBACK_FILE,
+    WORD_LENGTH,
+    variant_file,
+    word_checksum,
+)
+
+MAGIC = b'DTRE'
+# 2: built from version 2 feedback matrices (repeated letters scored right)
+FORMAT_VERSION = 2
+# magic, version, #vocab, #answers, checksum of vocab, checksum of answers
+HEADER = struct.Struct('<4sHIIII')
+# vocab row of the guess, number of children
+NODE = struct.Struct('<IH')
+# pattern code leading to a child
+EDGE = struct.Struct('<H')
+
+# A node is (vocab row to guess, {pattern code: child node}). The winning
+# pattern has no child.
+Node = tuple[int, dict[int, 'Node']]
+
+
+def build_node(matrix: FeedbackMatrix, remaining: Sequence[int]) -> Node:
+    """ Builds the solver's decision tree for the given answer columns.
+
+    The guess at each node is the one EntropySolver would make: the only
+    answer left, the first of two, or else the vocab word with the most
+    informative feedback.
+    """
+    answers = matrix.get_answers()
+    if len(remaining) <= 2:
+        row = matrix.vocab_index(answers[remaining[0]])
+    else:
+        row = best_in(matrix, range(len(matrix.get_vocab())), remaining)[1]
+    guess = matrix.get_vocab()[row]
+    children = {}
+    for code, bucket in partition(matrix, guess, remaining).items():
+        if answers[bucket[0]] == guess or len(bucket) == len(remaining):
+            # Won, or the answers left are repeats no guess can tell apart
+            continue
+        children[code] = build_node(matrix, bucket)
+    return row, children
+
+
+def _build_branch(remaining: Sequence[int]) -> Node:
+    """ Pool task: builds the subtree under one opening feedback pattern. """
+    return build_node(worker_matrix(), remaining)
+
+def build_tree(
+    matrix: FeedbackMatrix,
+    filename: str,
+    workers: Optional[int] = None
+) -> Node:
+    """ Builds the full decision tree over every answer, building the branch
+        under each opening feedback pattern in a separate process.
+
+    Parameters:
+        matrix: The feedback matrix
+        filename: Path of the matrix file, opened by the pool processes
+        workers: Number of processes (defaults to the CPU count)
+    """
+    remaining = list(range(len(matrix.get_answers())))
+    if len(remaining) <= 2:
+        return build_node(matrix, remaining)
+    row = best_in(matrix, range(len(matrix.get_vocab())), remaining)[1]
+    guess = matrix.get_vocab()[row]
+    buckets = partition(matrix, guess, remaining)
+    answers = matrix.get_answers()
+    branches = {code: bucket for code, bucket in buckets.items()
+                if answers[bucket[0]] != guess}
+    with matrix_pool(matrix, filename,
+                     workers or os.cpu_count() or 1) as pool:
+        # Biggest branches first so they don't hold up the end
+        codes = sorted(branches, key=lambda code: -len(branches[code]))
+        nodes = pool.map(_build_branch, [branches[code] for code in codes])
+        return row, dict(zip(codes, nodes))
+
+def save_tree(
+    node: Node,
+    vocab: Sequence[str],
+    answers: Sequence[str],
+    filename: str = DECISION_TREE_FILE
+) -> None:
+    """ Writes the tree in preorder: per node the guess row and child count,
+        then each child's pattern code followed by the child.
+    """
+    out = [HEADER.pack(MAGIC, FORMAT_VERSION, len(vocab), len(answers),
+                       word_checksum(vocab), word_checksum(answers))]
+    write_node(node, out, NODE, EDGE)
+    temp_name = filename + '.tmp'
+    with open(temp_name, 'wb') as file:
+        file.write(b''.join(out))
+    os.replace(temp_name, filename)
+
+
+class OpeningBook:
+    """ A solver decision tree loaded from disk. Looking up the next guess
+        walks one node per guess made, with no searching at play time.
+    """
+    def __init__(self, root: Node, vocab: Sequence[str]) -> None:
+        """ Wraps a decision tree.
+
+        Parameters:
+            root: The root node
+            vocab: The words indexed by the tree's vocab rows
+        """
+        self._root = root
+        self._vocab = vocab
+
+    def next_guess(self, history: Sequence[tuple[str, str]]) -> Optional[str]:
+        """ Returns the tree's guess after history, or None if history left
+            the tree (a guess the tree would not have made, or a pattern it
+            never saw).
+        """
+        node = self._root
+        for guess, processed in history:
+            row, children = node
+            if self._vocab[row] != guess:
+                return None
+            node = children.get(encode_pattern(processed))
+            if node is None:
+                return None
+        return self._vocab[node[0]]
+
+
+def load_book(
+    vocab: Sequence[str],
+    answers: Sequence[str],
+    filename: str = DECISION_TREE_FILE
+) -> Optional[OpeningBook]:
+    """ Loads the opening book for vocab and answers, or returns None if the
+        file is missing or was built from different word lists.
+    """
+    try:
+        with open(filename, 'rb') as file:
+            data = file.read()
+    except OSError:
+        return None
+    if len(data) < HEADER.size:
+        return None
+    magic, version, n_vocab, n_answers, vocab_sum, answers_sum = \
+        HEADER.unpack_from(data)
+    if (magic, version, n_vocab, n_answers) != (MAGIC, FORMAT_VERSION,
+                                                len(vocab), len(answers)):
+        return None
+    if (vocab_sum, answers_sum) != (word_checksum(vocab),
+                                    word_checksum(answers)):
+        return None
+    root, _ = read_node(data, HEADER.size, NODE, EDGE)
+    return OpeningBook(root, vocab)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description='Build the solver decision tree used by the a command.')
+    parser.add_argument('--length', type=int, default=WORD_LENGTH,
+                        help='number of letters in a word')
+    parser.add_argument('--workers', type=int,
+                        help='number of processes (default: CPU count)')
+    args = parser.parse_args(argv)
+
+    import gaming
+    import simulate
+
+    simulate.check_length(parser, args.length)
+    matrix = gaming.get_feedback_matrix(args.length)
+    filename = variant_file(DECISION_TREE_FILE, args.length)
+    start = time.perf_counter()
+    root = build_tree(matrix, variant_file(FEEDBACK_FILE, args.length),
+                      args.workers)
+    save_tree(root, *gaming.get_word_lists(args.length), filename)
+    print('Built', filename, 'in %.2fs' % (time.perf_counter() - start),
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
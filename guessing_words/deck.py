@@ -0,0 +1,90 @@
+from __future__ import annotations
+import os
+from array import array
+from random import Random, SystemRandom
+from typing import Optional, Sequence
+
+from support import DECK_FILE, word_checksum
+
+
+class AnswerDeck:
+    """ Deals answers in a seeded random order without repeats.
+
+        The deck is a shuffled permutation of word numbers, so a draw is one
+        lookup and the answers themselves are never copied. The seed and the
+        position in the deck are saved after every draw, so the order carries
+        on across runs. Once every answer has been dealt the deck is reshuffled
+        with a seed derived from the last one.
+    """
+    def __init__(
+        self,
+        words: Sequence[str],
+        filename: Optional[str] = DECK_FILE,
+        seed: Optional[int] = None
+    ) -> None:
+        """ Sets up the deck, resuming from filename if it matches words.
+
+        Parameters:
+            words: The answers to deal
+            filename: Where the deck position is saved, None to not save it
+            seed: Seed for a new deck, random if not given
+        """
+        self._words = words
+        self._filename = filename
+        self._fingerprint = word_checksum(words)
+        self._seed = seed if seed is not None else SystemRandom().getrandbits(64)
+        self._cursor = 0
+        self._load()
+        self._shuffle()
+
+    def _load(self) -> None:
+        """ Resumes the saved seed and position, if they are for these words.
+        """
+        if self._filename is None:
+            return
+        try:
+            with open(self._filename, 'r') as file:
+                seed, cursor, size, fingerprint = (int(value) for value
+                                                   in file.read().split())
+        except (OSError, ValueError):
+            return
+        if (size, fingerprint) == (len(self._words), self._fingerprint):
+            self._seed, self._cursor = seed, cursor
+
+    def _save(self) -> None:
+        """ Writes the seed and position so the next run carries on. """
+        if self._filename is None:
+            return
+        temp_name = self._filename + '.tmp'
+        with open(temp_name, 'w') as file:
+            file.write('%d %d %d %d\n' % (self._seed, self._cursor,
+                                          len(self._words), self._fingerprint))
+        os.replace(temp_name, self._filename)
+
+    def _shuffle(self) -> None:
+        """ Rebuilds the permutation for the current seed. """
+        self._order = array('I', range(len(self._words)))
+        Random(self._seed).shuffle(self._order)
+
+    def draw(self) -> str:
+        """ Returns the next answer, starting a new shuffle when the deck runs
+            out.
+        """
+        if not self._words:
+            raise IndexError('cannot draw from an empty deck')
+        if self._cursor >= len(self._order):
+            self._seed = Random(self._seed).getrandbits(64)
+            self._cursor = 0
+            self._shuffle()
+        word = self._words[self._order[self._cursor]]
+        self._cursor += 1
+        self._save()
+        return word
+
+    def remaining(self) -> int:
+        """ Returns how many answers are left before the deck is reshuffled. """
+        return len(self._order) - self._cursor
+
+    def __repr__(self) -> str:
+        """ Returns the computer representation of this deck. """
+        return f"AnswerDeck({len(self._words)} words, {self.remaining()} left)"
@@ -0,0 +1,216 @@
+from __future__ import annotations
+import argparse
+import os
+import struct
+import sys
+import time
+from array import array
+from typing import Optional, Sequence
+
+from feedback import FeedbackMatrix
+from support import (
+    DIFFICULTY_FILE,
+    MAX_GUESSES,
+    WORD_LENGTH,
+    variant_file,
+    word_checksum,
+)
+
+MAGIC = b'DIFF'
+# 2: answers left per game stored as a second score, entropy solver
+FORMAT_VERSION = 2
+# magic, version, #answers, checksum of the answers, reference solver
+HEADER = struct.Struct('<4sHII8s')
+# Answers are split into about equal thirds by difficulty
+TIERS = ('easy', 'medium', 'hard')
+# The entropy solver's guesses don't depend on where an answer sits in the
+# list, so neither does the difficulty measured with it
+REFERENCE_SOLVER = 'best'
+# Stored for answers the reference solver does not find in time
+LOST = MAX_GUESSES + 1
+
+# (guesses needed, answers left summed over the game's turns)
+Score = tuple[int, int]
+
+
+def answers_left(
+    matrix: FeedbackMatrix,
+    answer: str,
+    guesses: Sequence[str]
+) -> int:
+    """ Returns how many other answers were still possible after each of
+        guesses played against answer, summed over the guesses.
+
+    Two answers found in the same number of guesses differ here: one the
+    early guesses single out scores less than one that stays hidden among
+    others until the end.
+
+    Parameters:
+        matrix: The feedback matrix
+        answer: The hidden word
+        guesses: The guesses made, in order
+    """
+    column = matrix.answer_index(answer)
+    remaining = range(len(matrix.get_answers()))
+    total = 0
+    for guess in guesses:
+        row = matrix.row(guess)
+        code = row[column]
+        remaining = [j for j in remaining if row[j] == code]
+        total += len(remaining) - 1
+    return total
+
+def _cuts(scores: Sequence[Score], parts: int) -> list[int]:
+    """ Returns where to split scores (sorted) into parts: at the change of
+        score nearest each equal split, so equal scores share a tier.
+    """
+    changes = [i for i in range(1, len(scores))
+               if scores[i] != scores[i - 1]]
+    cuts = []
+    for part in range(1, parts):
+        target = len(scores) * part / parts
+        after = [i for i in changes if not cuts or i > cuts[-1]]
+        cuts.append(min(after, key=lambda i: abs(i - target),
+                        default=len(scores)))
+    return cuts
+
+
+class DifficultyTable:
+    """ How hard the reference solver finds each answer, with the answers
+        split into tiers.
+
+        An answer's score is the guesses the solver needs, then the answers
+        left summed over its turns. Each tier holds the answer numbers of
+        about a third of the answers, easiest first, with the boundaries
+        drawn where the score changes.
+    """
+    def __init__(self, guesses: Sequence[int], left: Sequence[int]) -> None:
+        """ Sets up the tiers.
+
+        Parameters:
+            guesses: Guesses needed for each answer, LOST if never found
+            left: Answers left for each answer, as given by answers_left
+        """
+        self._guesses = array('B', guesses)
+        self._left = array('H', left)
+        ranked = sorted(range(len(self._guesses)), key=self.get_score)
+        scores = [self.get_score(answer) for answer in ranked]
+        bounds = [0] + _cuts(scores, len(TIERS)) + [len(ranked)]
+        self._tiers = {name: array('I', ranked[bounds[t]:bounds[t + 1]])
+                       for t, name in enumerate(TIERS)}
+
+    def get_guesses(self, answer: int) -> int:
+        """ Returns the guesses the reference solver needs for an answer
+            number, LOST if it never finds it.
+        """
+        return self._guesses[answer]
+
+    def get_score(self, answer: int) -> Score:
+        """ Returns the score of an answer number; higher is harder. """
+        return self._guesses[answer], self._left[answer]
+
+    def get_tier(self, name: str) -> Sequence[int]:
+        """ Returns the answer numbers in a tier (one of TIERS). """
+        return self._tiers[name]
+
+    def save(
+        self,
+        answers: Sequence[str],
+        filename: str = DIFFICULTY_FILE,
+        solver: str = REFERENCE_SOLVER
+    ) -> None:
+        """ Writes the guess counts then the answers left (uint16), after a
+            header naming the answers and the solver they were measured with.
+        """
+        temp_name = filename + '.tmp'
+        with open(temp_name, 'wb') as file:
+            file.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(answers),
+                                   word_checksum(answers), solver.encode()))
+            file.write(self._guesses.tobytes())
+            file.write(self._left.tobytes())
+        os.replace(temp_name, filename)
+
+    def __repr__(self) -> str:
+        """ Returns the computer representation of this table. """
+        return f"DifficultyTable({len(self._guesses)} answers)"
+
+
+def measure(
+    solver_name: str = REFERENCE_SOLVER,
+    workers: Optional[int] = None,
+    length: int = WORD_LENGTH
+) -> DifficultyTable:
+    """ Plays the reference solver against every answer of a word length, in
+        parallel, and returns how hard each game was.
+    """
+    import gaming
+    import simulate
+
+    answers = list(gaming.get_word_lists(length)[1])
+    results = simulate.simulate(solver_name, answers, workers, length)
+    matrix = gaming.get_feedback_matrix(length)
+    return DifficultyTable(
+        [len(guesses) if won else LOST for _, guesses, won in results],
+        [answers_left(matrix, answer, guesses)
+         for answer, guesses, _ in results])
+
+def load_table(
+    answers: Sequence[str],
+    filename: str = DIFFICULTY_FILE
+) -> Optional[DifficultyTable]:
+    """ Loads the table for answers, or returns None if the file is missing
+        or was measured on a different answer list.
+    """
+    try:
+        with open(filename, 'rb') as file:
+            data = file.read()
+    except OSError:
+        return None
+    if len(data) != HEADER.size + 3 * len(answers):
+        return None
+    magic, version, count, checksum, _ = HEADER.unpack_from(data)
+    if (magic, version, count, checksum) != (
+            MAGIC, FORMAT_VERSION, len(answers), word_checksum(answers)):
+        return None
+    start = HEADER.size + len(answers)
+    left = array('H')
+    left.frombytes(data[start:])
+    return DifficultyTable(data[HEADER.size:start], left)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description='Measure how hard each answer is for a reference solver.')
+    parser.add_argument('--solver', default=REFERENCE_SOLVER,
+                        help='solver to measure with (default: %(default)s)')
+    parser.add_argument('--length', type=int, default=WORD_LENGTH,
+                        help='number of letters in a word')
+    parser.add_argument('--workers', type=int,
+                        help='number of processes (default: CPU count)')
+    args = parser.parse_args(argv)
+
+    import gaming
+    import simulate
+
+    if args.solver not in simulate.SOLVERS:
+        parser.error('--solver must be one of: ' + ', '.join(simulate.SOLVERS))
+    simulate.check_length(parser, args.length)
+    filename = variant_file(DIFFICULTY_FILE, args.length)
+    start = time.perf_counter()
+    table = measure(args.solver, args.workers, args.length)
+    table.save(gaming.get_word_lists(args.length)[1], filename, args.solver)
+    for name in TIERS:
+        tier = table.get_tier(name)
+        scores = [table.get_score(answer) for answer in tier]
+        guesses = ['lost' if count == LOST else str(count)
+                   for count in (min(scores, default=(0, 0))[0],
+                                 max(scores, default=(0, 0))[0])]
+        print('%-6s %4d answers, %s-%s guesses, %.1f answers left on average'
+              % (name, len(tier), *guesses,
+                 sum(left for _, left in scores) / max(len(scores), 1)))
+    print('Wrote', filename, 'in %.2fs' % (time.perf_counter() - start),
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
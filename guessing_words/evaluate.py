@@ -0,0 +1,183 @@
+from __future__ import annotations
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional, Sequence
+
+import gaming
+import simulate
+from adversary import partition
+from feedback import decode_pattern
+from support import MAX_GUESSES
+
+# Answers not found within MAX_GUESSES are counted here
+UNSOLVED = 0
+# Solvers whose guess depends on the history, not just the answers left
+HISTORY_DEPENDENT = {'next'}
+
+Policy = Callable[[Sequence[str], tuple], Optional[str]]
+
+
+class Evaluator:
+    """ Works out exactly how a policy fares against every answer by playing
+        all answers at once: each guess splits the answers left by their
+        feedback, and each group is followed separately, up to MAX_GUESSES.
+
+        With memo on, results for a group of answers are memoised on the group
+        (and the guesses left), so the policy must pick its guess from the
+        answers still possible, not from how it got there. EntropySolver
+        works that way; guess_next does not (it filters the whole vocab by the
+        history), so it is evaluated with memo off.
+    """
+    def __init__(
+        self,
+        policy: Policy,
+        words: Sequence[str],
+        matrix: gaming.FeedbackMatrix,
+        memo: bool = True
+    ) -> None:
+        """ Sets up an evaluator.
+
+        Parameters:
+            policy: A guess_next style function taking (words, history)
+            words: The guessable words passed to policy
+            matrix: The feedback matrix for the vocab and answers
+            memo: Whether to reuse results for identical groups of answers
+        """
+        self._policy = policy
+        self._words = words
+        self._matrix = matrix
+        self._memo = {} if memo else None
+
+    def solve(
+        self,
+        history: tuple[tuple[str, str], ...],
+        remaining: Sequence[int],
+        guesses_left: int = MAX_GUESSES
+    ) -> Counter:
+        """ Returns how many of the remaining answers take k more guesses,
+            as a Counter of k (UNSOLVED for answers not found in time).
+
+        Parameters:
+            history: The guesses that led to remaining
+            remaining: Answer columns consistent with history
+            guesses_left: Guesses the player has left
+        """
+        key = (tuple(remaining), guesses_left)
+        if self._memo is not None and key in self._memo:
+            return self._memo[key]
+        result = Counter()
+        guess = self._policy(self._words, history) if guesses_left else None
+        if guess is None:
+            result[UNSOLVED] = len(remaining)
+        else:
+            answers = self._matrix.get_answers()
+            for code, bucket in partition(self._matrix, guess,
+                                          remaining).items():
+                if answers[bucket[0]] == guess:
+                    result[1] += 1
+                    bucket = bucket[1:]
+                    if not bucket:
+                        continue
+                pattern = decode_pattern(code, len(guess))
+                below = self.solve(history + ((guess, pattern),), bucket,
+                                   guesses_left - 1)
+                for k, count in below.items():
+                    result[k + 1 if k != UNSOLVED else UNSOLVED] += count
+        if self._memo is not None:
+            self._memo[key] = result
+        return result
+
+
+_worker_evaluator = None
+
+def _init_worker(solver_name: str) -> None:
+    """ Sets up one evaluator per pool process. """
+    global _worker_evaluator
+    simulate.init_worker()
+    policy = getattr(gaming, simulate.SOLVERS[solver_name])
+    _worker_evaluator = Evaluator(policy, gaming.available_vocab,
+                                  gaming.get_feedback_matrix(),
+                                  solver_name not in HISTORY_DEPENDENT)
+
+def _solve_branch(
+    history: tuple[tuple[str, str], ...],
+    remaining: Sequence[int]
+) -> Counter:
+    """ Pool task: solves the answers under one opening feedback pattern. """
+    return _worker_evaluator.solve(history, remaining, MAX_GUESSES - 1)
+
+def evaluate(solver_name: str, workers: Optional[int] = None) -> Counter:
+    """ Returns the exact number of guesses solver_name needs for every
+        answer, as a Counter of guesses (UNSOLVED for answers never found).
+
+    The opening guess is made here and the answers under each of its
+    feedback patterns are solved in separate processes.
+    """
+    matrix = gaming.get_feedback_matrix()
+    policy = getattr(gaming, simulate.SOLVERS[solver_name])
+    answers = matrix.get_answers()
+    remaining = list(range(len(answers)))
+    guess = policy(gaming.available_vocab, ())
+    result = Counter()
+    branches = []
+    for code, bucket in partition(matrix, guess, remaining).items():
+        if answers[bucket[0]] == guess:
+            result[1] += 1
+            bucket = bucket[1:]
+        if bucket:
+            pattern = decode_pattern(code, len(guess))
+            branches.append((((guess, pattern),), bucket))
+    branches.sort(key=lambda branch: -len(branch[1]))
+    with ProcessPoolExecutor(workers or os.cpu_count() or 1,
+                             initializer=_init_worker,
+                             initargs=(solver_name,)) as pool:
+        futures = [pool.submit(_solve_branch, history, bucket)
+                   for history, bucket in branches]
+        for future in futures:
+            for k, count in future.result().items():
+                result[k + 1 if k != UNSOLVED else UNSOLVED] += count
+    return result
+
+def summarise(result: Counter) -> tuple[tuple[int, ...], float, int]:
+    """ Returns the stats tuple (as shown by print_stats), the expected number
+        of guesses over solved answers and the worst case (0 if some answer
+        is never solved).
+    """
+    stats = [0] * (MAX_GUESSES + 1)
+    for k, count in result.items():
+        stats[k - 1 if k != UNSOLVED else MAX_GUESSES] += count
+    solved = {k: count for k, count in result.items() if k != UNSOLVED}
+    total = sum(solved.values())
+    expected = sum(k * count for k, count in solved.items()) / total \
+        if total else 0.0
+    worst = 0 if result[UNSOLVED] else max(solved, default=0)
+    return tuple(stats), expected, worst
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description='Exactly evaluate a solver over every answer.')
+    parser.add_argument('--solver', choices=simulate.SOLVERS, default='best')
+    parser.add_argument('--workers', type=int,
+                        help='number of processes (default: CPU count)')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    result = evaluate(args.solver, args.workers)
+    elapsed = time.perf_counter() - start
+    stats, expected, worst = summarise(result)
+    gaming.print_stats(stats)
+    print('Expected guesses: %.4f' % expected)
+    print('Worst case:', worst if worst else 'lost')
+    for k in sorted(k for k in result if k != UNSOLVED):
+        print('  %d guesses: %d' % (k, result[k]))
+    if result[UNSOLVED]:
+        print('  lost: %d' % result[UNSOLVED])
+    print('Evaluated in %.2fs' % elapsed, file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+from __future__ import annotations
+import mmap
+import os
+import struct
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import sha1
+from typing import Iterable, Sequence
+
+from support import (
+    FEEDBACK_FILE,
+    VOCAB_FILE,
+    ANSWERS_FILE,
+    CORRECT,
+    MISPLACED,
+    INCORRECT,
+    WORD_LENGTH,
+)
+
+# Base 3 digit for each square. The first letter of a pattern is the most
+# significant digit, so an all green 6 letter pattern encodes to 3**6 - 1.
+DIGITS = {INCORRECT: 0, MISPLACED: 1, CORRECT: 2}
+SQUARES = (INCORRECT, MISPLACED, CORRECT)
+
+MAGIC = b'FBMX'
+# 2: cells scored by score_pattern, which handles repeated letters
+FORMAT_VERSION = 2
+# magic, version, #vocab, #answers, digest of vocab, digest of answers
+HEADER = struct.Struct('<4sHII20s20s')
+# Cells start on an aligned offset so the buffer can be cast to uint16.
+HEADER_SIZE = 64
+
+
+def encode_pattern(pattern: str) -> int:
+    """ Encodes a pattern of squares (as returned by process_user) as a
+        base 3 integer.
+
+    Parameters:
+        pattern: The processed form of a guess
+
+    Returns:
+        The pattern code
+    """
+    code = 0
+    for square in pattern:
+        code = code * 3 + DIGITS[square]
+    return code
+
+def decode_pattern(code: int, length: int = WORD_LENGTH) -> str:
+    """ Turns a pattern code back into its squares.
+
+    Parameters:
+        code: A code produced by encode_pattern
+        length: The number of letters in the pattern
+
+    Returns:
+        The processed form of a guess
+    """
+    squares = []
+    for _ in range(length):
+        code, digit = divmod(code, 3)
+        squares.append(SQUARES[digit])
+    return ''.join(reversed(squares))
+
+def score_pattern(guess: str, answer: str) -> int:
+    """ Scores guess against answer, returning the pattern code.
+
+    Letters in the right place are green. The other letters of the answer
+    are counted, and each remaining guess letter, left to right, is yellow
+    while the answer still has an unmatched copy of it and grey after that,
+    so repeated letters in either word are scored correctly. Each word is
+    walked once per pass.
+
+    Parameters:
+        guess: The guessed word
+        answer: The hidden word, the same length as guess
+
+    Returns:
+        The pattern code
+    """
+    unmatched = {}
+    for g, a in zip(guess, answer):
+        if g != a:
+            unmatched[a] = unmatched.get(a, 0) + 1
+    code = 0
+    for g, a in zip(guess, answer):
+        if g == a:
+            code = code * 3 + 2
+        elif unmatched.get(g):
+            unmatched[g] -= 1
+            code = code * 3 + 1
+        else:
+            code *= 3
+    return code
+
+def score_many(guesses: Iterable[str], answer: str) -> array:
+    """ Scores every guess against one answer.
+
+    Returns:
+        The pattern codes as a uint16 array, in the order of guesses
+    """
+    return array('H', [score_pattern(guess, answer) for guess in guesses])
+
+def score_against_all(guess: str, answers: Iterable[str]) -> array:
+    """ Scores one guess against every answer, giving a matrix row.
+
+    Returns:
+        The pattern codes as a uint16 array, in the order of answers
+    """
+    return array('H', [score_pattern(guess, answer) for answer in answers])
+
+def _digest(words: Sequence[str]) -> bytes:
+    """ Returns a fingerprint of an ordered run of words. """
+    return sha1('\n'.join(words).encode()).digest()
+
+
+class FeedbackMatrix:
+    """ A read only, memory mapped table holding the pattern code of every
+        vocab word guessed against every answer.
+
+        Rows are vocab words and columns are answers, both in file order.
+    """
+    def __init__(
+        self,
+        vocab: Sequence[str],
+        answers: Sequence[str],
+        filename: str
+    ) -> None:
+        """ Maps an up to date matrix file into memory.
+
+        Parameters:
+            vocab: The guessable words (rows)
+            answers: The possible answers (columns)
+            filename: The path to the matrix file
+        """
+        self._vocab = vocab
+        self._answers = answers
+        self._vocab_index = {word: i for i, word in enumerate(vocab)}
+        self._answer_index = {word: i for i, word in enumerate(answers)}
+        with open(filename, 'rb') as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._cells = memoryview(self._map)[HEADER_SIZE:].cast('H')
+        self._width = len(answers)
+
+    def get_vocab(self) -> Sequence[str]:
+        """ Returns the words indexing the rows of this matrix. """
+        return self._vocab
+
+    def get_answers(self) -> Sequence[str]:
+        """ Returns the words indexing the columns of this matrix. """
+        return self._answers
+
+    def vocab_index(self, guess: str) -> int:
+        """ Returns the row number of guess. """
+        return self._vocab_index[guess]
+
+    def answer_index(self, answer: str) -> int:
+        """ Returns the column number of answer. """
+        return self._answer_index[answer]
+
+    def code(self, guess: str, answer: str) -> int:
+        """ Returns the pattern code of guess against answer in O(1). """
+        row = self._vocab_index[guess]
+        return self._cells[row * self._width + self._answer_index[answer]]
+
+    def row(self, guess: str) -> memoryview:
+        """ Returns the pattern codes of guess against every answer. """
+        return self.row_at(self._vocab_index[guess])
+
+    def row_at(self, row: int) -> memoryview:
+        """ Returns the pattern codes of the vocab word at the given row. """
+        start = row * self._width
+        return self._cells[start:start + self._width]
+
+    def column_at(self, column: int) -> memoryview:
+        """ Returns the pattern codes of every vocab word against the answer
+            at the given column.
+        """
+        return self._cells[column::self._width]
+
+    def close(self) -> None:
+        """ Releases the memory map. """
+        self._cells.release()
+        self._map.close()
+
+    def __repr__(self) -> str:
+        """ Returns the computer representation of this matrix. """
+        return f"FeedbackMatrix({len(self._vocab)} x {len(self._answers)})"
+
+
+def _read_header(filename: str) -> tuple[int, int, bytes, bytes] | None:
+    """ Returns (#vocab, #answers, vocab digest, answers digest) stored in a
+        matrix file, or None if the file is missing or not a current matrix.
+    """
+    try:
+        with open(filename, 'rb') as file:
+            raw = file.read(HEADER.size)
+    except OSError:
+        return None
+    if len(raw) != HEADER.size:
+        return None
+    magic, version, n_vocab, n_answers, vocab_digest, answers_digest = \
+        HEADER.unpack(raw)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        return None
+    return n_vocab, n_answers, vocab_digest, answers_digest
+
+def _reusable(
+    header: tuple[int, int, bytes, bytes] | None,
+    vocab: Sequence[str],
+    answers: Sequence[str]
+) -> tuple[int, int]:
+    """ Works out how much of an existing matrix is still valid.
+
+    A matrix stays valid when the current word lists only add words to the end
+    of the lists it was built from.
+
+    Returns:
+        The number of (vocab, answers) rows and columns that can be reused,
+        (0, 0) if the matrix must be built from scratch.
+    """
+    if header is None:
+        return 0, 0
+    n_vocab, n_answers, vocab_digest, answers_digest = header
+    if n_vocab > len(vocab) or n_answers > len(answers):
+        return 0, 0
+    if (_digest(vocab[:n_vocab]) != vocab_digest
+            or _digest(answers[:n_answers]) != answers_digest):
+        return 0, 0
+    return n_vocab, n_answers
+
+def build_feedback_matrix(
+    vocab: Sequence[str],
+    answers: Sequence[str],
+    filename: str = FEEDBACK_FILE
+) -> None:
+    """ Writes the matrix file for vocab against answers.
+
+    Cells already present in an older matrix built from a prefix of these word
+    lists are copied across; only the cells for appended words are scored.
+
+    Parameters:
+        vocab: The guessable words
+        answers: The possible answers
+        filename: The path to the matrix file
+    """
+    old_vocab, old_answers = _reusable(_read_header(filename), vocab, answers)
+    old = None
+    if old_vocab and old_answers:
+        old = FeedbackMatrix(vocab[:old_vocab], answers[:old_answers], filename)
+
+    temp_name = filename + '.tmp'
+    with open(temp_name, 'wb') as file:
+        header = HEADER.pack(MAGIC, FORMAT_VERSION, len(vocab), len(answers),
+                             _digest(vocab), _digest(answers))
+        file.write(header.ljust(HEADER_SIZE, b'\0'))
+        for i, guess in enumerate(vocab):
+            if old is not None and i < old_vocab:
+                row = array('H', old.row_at(i))
+                row.extend(score_against_all(guess, answers[old_answers:]))
+            else:
+                row = score_against_all(guess, answers)
+            file.write(row.tobytes())
+    if old is not None:
+        old.close()
+    os.replace(temp_name, filename)
+
+def load_feedback_matrix(
+    vocab: Sequence[str],
+    answers: Sequence[str],
+    filename: str = FEEDBACK_FILE
+) -> FeedbackMatrix:
+    """ Opens the matrix for vocab against answers, (re)building it first if
+        the file is missing or out of date.
+
+    Parameters:
+        vocab: The guessable words
+        answers: The possible answers
+        filename: The path to the matrix file
+
+    Returns:
+        The memory mapped matrix
+    """
+    header = _read_header(filename)
+    if _reusable(header, vocab, answers) != (len(vocab), len(answers)):
+        build_feedback_matrix(vocab, answers, filename)
+    return FeedbackMatrix(vocab, answers, filename)
+
+
+_worker_matrix = None
+
+def _open_in_worker(
+    vocab: Sequence[str],
+    answers: Sequence[str],
+    filename: str
+) -> None:
+    """ Opens the feedback matrix once in each pool process. """
+    global _worker_matrix
+    _worker_matrix = FeedbackMatrix(vocab, answers, filename)
+
+def matrix_pool(
+    matrix: FeedbackMatrix,
+    filename: str,
+    workers: int
+) -> ProcessPoolExecutor:
+    """ Starts a process pool whose processes each map the matrix file, for
+        tasks that read it through worker_matrix.
+
+    Parameters:
+        matrix: The feedback matrix
+        filename: The path to the matrix file
+        workers: Number of processes
+    """
+    return ProcessPoolExecutor(
+        workers, initializer=_open_in_worker,
+        initargs=(tuple(matrix.get_vocab()), tuple(matrix.get_answers()),
+                  filename))
+
+def worker_matrix() -> FeedbackMatrix:
+    """ Returns the matrix mapped in this process by matrix_pool. """
+    return _worker_matrix
+
+
+if __name__ == "__main__":
+    from support import load_words
+
+    matrix = load_feedback_matrix(load_words(VOCAB_FILE),
+                                  load_words(ANSWERS_FILE))
+    print('Feedback matrix ready:', matrix)
@@ -1,6 +1,7 @@
 from __future__ import annotations
+import argparse
+import os
 from random import choice, seed
-from string import ascii_lowercase
 from typing import Optional
 
 
@@ -9,11 +10,30 @@ from support import (
     choose_word,
     VOCAB_FILE,
     ANSWERS_FILE,
-    CORRECT,
-    MISPLACED,
-    INCORRECT,
-    UNSEEN,
+    FEEDBACK_FILE,
+    DECISION_TREE_FILE,
+    DECK_FILE,
+    DIFFICULTY_FILE,
+    STATS_FILE,
+    STATS_LOG_FILE,
+    WORD_LENGTH,
+    MAX_WORD_LENGTH,
+    MAX_GUESSES,
+    variant_file,
 )
+from word_index import get_index
+from bk_tree import get_tree
+from history import GuessHistory, as_history
+from word_store import WordStore
+from deck import AnswerDeck
+from stats import StatsStore
+from adversary import AdversarialGame
+from decision_tree import OpeningBook, load_book
+from feedback import FeedbackMatrix, load_feedback_matrix, score_pattern, decode_pattern
+from solver import EntropySolver, remaining_answers
+from multiboard import JointSolver
+from hints import HINT_COUNT, iter_top_k
+from difficulty import DifficultyTable, TIERS, load_table
 
 
 def has_won(guess: str, answer: str) -> bool:
@@ -29,13 +49,14 @@ def has_won(guess: str, answer: str) -> bool:
     else:
         return False
 
-def has_lost(guess_number: int) -> bool:
+def has_lost(guess_number: int, max_guesses: int = MAX_GUESSES) -> bool:
     """ Losing condition.
             Parameter:
-                guess_number (int): if guess_number over 6 then lose
+                guess_number (int): if guess_number reaches max_guesses then lose
+                max_guesses (int): number of guesses allowed, 6 by default
             Return bool
     """
-    if guess_number >= 6:
+    if guess_number >= max_guesses:
         return True
     else:
         return False
@@ -62,7 +83,7 @@ def remove_word(words: tuple[str, ...], word: str) -> tuple():
     new_words = words[0:word_position] + words[word_position+1:] #create a new tuple without word
     return new_words
 
-def load_words(filename: str) -> tuple():
+def load_words(filename: str) -> WordStore:
     """ Loads all words from the file with the given name.
 
             Parameters:
@@ -70,11 +91,9 @@ def load_words(filename: str) -> tuple():
 						a separate line.
 
             Returns:
-		tuple<str>: A tuple containing all the words in the file.
+		WordStore: A read only sequence of all the words in the file. The file is read the first time the words are used.
     """
-    with open(filename, 'r') as file:
-        words = [line.strip() for line in file.readlines()]
-    return tuple(words)
+    return WordStore(filename)
 
 def choose_word(words: tuple[str,...]) -> str:
     """ Chooses a word at random from words.
@@ -87,12 +106,14 @@ def choose_word(words: tuple[str,...]) -> str:
     """
     return choice(words)
 
-def prompt_user(guess_number: int, words: tuple[str, ...]) -> str:
+def prompt_user(guess_number: int, words: tuple[str, ...], length: int = WORD_LENGTH, hard_history: Optional[GuessHistory] = None) -> str:
     """ Prompt the user next guess and reprompting until a valid input is enter.
             Parameter: 
                 guess_number(int)
-                words (tuple<str>): tuple of valid guess
-                guess (str): user input. must be in tuple(words) and has 6 letters
+                words (WordStore): valid guesses, checked with a hash lookup
+                length (int): number of letters in a word, 6 by default
+                hard_history (GuessHistory): in hard mode, the guesses so far; a guess not fitting their feedback is rejected
+                guess (str): user input. must be in words and has length letters
             Return guess or help('h') or keyboard ('k') or solver ('a') or quit ('q')
     """
     while True:
@@ -106,56 +127,43 @@ def prompt_user(guess_number: int, words: tuple[str, ...]) -> str:
             break
         if guess == 'q':
             break
-        if len(guess) == 6 and guess not in words:
+        if len(guess) == length and guess not in words:
             print("Invalid! Unknown word")
+            suggestions = get_tree(words).suggest(guess) #closest valid words by edit distance
+            if suggestions:
+                print("Did you mean:", ", ".join(suggestions) + "?")
             continue
-        if len(guess) != 6:
-            print("Invalid! Guess must be of length 6")
+        if len(guess) != length:
+            print("Invalid! Guess must be of length %d" %(length))
             continue
-        if len(guess) == 6 and guess in words:
+        if len(guess) == length and guess in words:
+            reason = hard_history.check_hard(guess) if hard_history is not None else None #checked against the summary, not by replaying guesses
+            if reason is not None:
+                print("Invalid! " + reason)
+                continue
             break
     return guess
     
 def process_user(guess: str, answer: str) -> str:
     """ Representation of guess: green box if letter in corrected position; yellow box if letter appeal in answer but in uncorrected position; black box if letter not in answer
+            Repeated letters get one green or yellow box per copy of the letter in answer, greens first then yellows from the left; the rest are black
             Parameter: 
-                guess(str): guess in put of user, must contain 6 letters (letters can be duplicate) and exist in vocab.txt
-                answer(str): choose from answer.txt contain 6 unique letters
+                guess(str): guess in put of user, must be as long as answer (letters can be duplicate) and exist in vocab.txt
+                answer(str): choose from answer.txt (letters can be duplicate)
             Return str of square 
     """
-    guess_letter = tuple(guess)
-    ans_letter = tuple(answer)
-    match = []
-    guess_enu = [[i, j] for i, j in enumerate(guess_letter)]
-    ans_enu = [[i, j] for i, j in enumerate(ans_letter)]
-    for index in range(6): #loop for comparing each letter of guess with each letter of answer at the same position
-        if guess_enu[index] == ans_enu[index]: #green square if letter of guess in correct position 
-            match.append(CORRECT)
-        elif guess_enu[index] != ans_enu[index] and guess_enu[index][1] in ans_letter: #letter of guess at index position is not the same for answer at that position but letter in answer
-            if guess_enu[index][1] in guess[index:]: #if duplicate letter in guess
-                x = find_word(guess_enu[index][1], answer) #find misplace letter position answer
-                if guess_enu[x] == ans_enu[x]: #if the other position is match, then return black at this position
-                    match.append(INCORRECT)
-                elif guess_enu[index][1] in guess[:index]: #if letter has been processed before -> black
-                    match.append(INCORRECT)
-                else:
-                    match.append(MISPLACED) #misplaced if this letter never been processed and other position is not correct 
-            else:
-                match.append(MISPLACED) #not duplicate then misplaced
-        else:
-            match.append(INCORRECT)
-    processed_guess = ''.join(match)
-    return processed_guess
+    return decode_pattern(score_pattern(guess, answer), len(guess)) #one counting pass per word, shared with the feedback matrix
         
-def update_history(history: tuple[tuple[[str, str]], ...], guess: str, answer: str) -> tuple[tuple[str, str], ...]:   
+def update_history(history: GuessHistory, guess: str, answer: str) -> GuessHistory:   
     """ A history update including all guesses and its processe form.
             Parameter:
-                history(tuple<(str, str),>): contain guess and its processed form
+                history(GuessHistory): contain guess and its processed form, a tuple<(str, str),> is folded into a new GuessHistory
                 guess(str): guess prompted by user
                 answer(str): chosen at the beginning of gameplay.
-            Return history(('guess', 'processed guess))
+            Return history(('guess', 'processed guess)), updated in place
     """
-    history = history + (((guess, process_user(guess, answer))),) #update the history with new guess and its processed form
+    history = as_history(history) #fold a plain tuple history into a GuessHistory once
+    history.add(guess, process_user(guess, answer)) #update the history with new guess and its processed form
     return history
 
 def print_history(history: tuple[tuple[str, str], ...]) -> None:
@@ -179,15 +187,7 @@ def print_keyboard(history: tuple[tuple[str, str], ...]) -> None:
         Return
             print list of all letters with the known information about which letters have been guessed and their processed form
     """
-    dic_alphabet = dict.fromkeys(ascii_lowercase, UNSEEN) #create dictionary with key: alphabet anf value: UNSEEN
-
-    for x in range(len(history)):
-        key = list(history[x][0])
-        value = list(history[x][1])
-        dic_guess = dict(zip(key, value)) #create dictionary with key: letter in guesses and value is its processed form
-        for letter in dic_alphabet:
-            if letter in dic_guess and dic_guess[letter]>dic_alphabet[letter]: #update processed letter in the alphabet dictionary
-                dic_alphabet[letter] = dic_guess[letter]
+    dic_alphabet = as_history(history).get_letter_states() #best processed form seen for each letter, kept up to date by the history
     lp = list(dic_alphabet.items())
     print("\nKeyboard information\n------------")
     for i in range(0,len(lp),2):
@@ -195,17 +195,45 @@ def print_keyboard(history: tuple[tuple[str, str], ...]) -> None:
     print('')
     return
 
+def print_hints(history: tuple[tuple[str, str], ...], length: int = WORD_LENGTH, k: int = HINT_COUNT, hard: bool = False) -> None:
+    """ Print the best next guesses.
+        Parameter:
+            history (tuple<(str, str), >): result from update_history()
+            length (int): number of letters in a word
+            k (int): number of guesses to print
+            hard (bool): hard mode, only suggest guesses that fit the feedback given so far
+        Return
+            print the k guesses expected to leave the fewest possible answers, with how many they leave on average
+    """
+    matrix = get_feedback_matrix(length)
+    rows = None #the whole vocab
+    if hard:
+        index = get_index(get_word_lists(length)[0])
+        rows = index.numbers_in(index.compile(as_history(history))) #word numbers are the matrix's vocab rows
+    hints = []
+    for hints in iter_top_k(matrix, remaining_answers(matrix, history), k, rows): #best k so far, kept in a small heap while the vocab is scored
+        print('\rSearching... best so far: ' + ' '.join(word for word, _ in hints), end='', flush=True) #show the early leaders while the scan finishes
+    print('\r\033[K', end='') #clear the progress line
+    if not hints:
+        print('\nNo answer fits your guesses.\n')
+        return
+    print("\nBest next guesses\n------------")
+    for word, expected in hints:
+        print('{}: {:.2f} answers left on average'.format(word, expected))
+    print('')
+    return
+
 def print_stats(stats: tuple[int,...]) -> None:
     """ Print the stats of the game.
             Parameter:
-                stats (tuple<str>): tuple contains 7 elements representing which round won in 1-6 guesses and the number of rounds lost.
+                stats (tuple<str>): tuple contains max guesses + 1 elements representing which round won in 1-6 guesses and the number of rounds lost.
             Return: 
                 print status of game play
     """
     print('\nGames won in:') 
     for i in range(len(stats)-1):
         print('%d moves:' %(i+1), stats[i]) #print each move and its status
-    print('Games lost:', stats[6])
+    print('Games lost:', stats[-1])
     return None
 
 def guess_next(words: tuple[str,...], history: tuple[[str, str], ...]) -> optional[str]:
@@ -214,100 +242,289 @@ def guess_next(words: tuple[str,...], history: tuple[[str, str], ...]) -> option
                 words(tuple<str>): tuple contains all the available vocabs
                 history (tuple<(str, str>, ...): result of uqdate_history
             Return
-                generate a valid guess without violating the previous processed guess
+                generate a valid guess without violating the previous processed guess, None if there is none
             
     """
-    possible_list = list(words) #list store available vocab
-    for w in range(len(words)): #slice word in available vocab
-        for attempt in range(len(history)):   #slice element in history
-            for i in range(6): #slicing letter position in user's guess
-                    if history[attempt][1][i] == CORRECT and history[attempt][0][i] != words[w][i]: #if letter is green and isn't in word then change word to none
-                        possible_list[w] = None 
-                        break
-                    elif history[attempt][1][i] == INCORRECT and history[attempt][0][i] in words[w]: #letter is black and is in word 
-                        if history[attempt][0][i] not in history[attempt][0][:i]: 
-                            if history[attempt][0][i] not in history[attempt][0][i+1:]: #letter is not duplicated in guess then change word to none
-                                possible_list[w] = None
-                                break
-                            elif history[attempt][0][i] in history[attempt][0][i:]: #letter is duplicated and equal to the letter at the same position of word then change word to none
-                                if history[attempt][0][i] == words[w][i]:
-                                    possible_list[w] = None
-                                    break
-                    elif history[attempt][1][i] == MISPLACED and history[attempt][0][i] not in words[w]: #letter is yellow and not in word then word -> none
-                        possible_list[w] = None
-                        break
-                    elif history[attempt][1][i] == MISPLACED and history[attempt][0][i] == words[w][i]: #letter is yellow and equal to the letter in the same position of word then word -> none
-                        possible_list[w] = None
-                        break
-    possible_list = list(filter(None, possible_list)) #delete all the none
-    pos_guess = possible_list[0] #non-random choose word by choosing 1st word of the list
-    return pos_guess
+    index = get_index(words) #bitset index, built the first time words is seen
+    return index.first(index.compile(as_history(history))) #non-random choose word by choosing 1st consistent word
+
+def guess_best(words: tuple[str,...], history: tuple[[str, str], ...]) -> Optional[str]:
+    """ Generate the most informative guess for the user.
+            Parameters:
+                words(tuple<str>): tuple contains all the available vocabs
+                history (tuple<(str, str>, ...): result of update_history
+            Return
+                the guess from words that splits the answers still possible into the most even groups of feedback, None if no answer is possible
+    """
+    length = len(words[0]) if len(words) else WORD_LENGTH
+    book = get_opening_book(length)
+    if book is not None and words is get_word_lists(length)[0]: #follow the prebuilt decision tree while the game stays on it
+        guess = book.next_guess(history)
+        if guess is not None:
+            return guess
+    return get_entropy_solver(length).guess(words, history)
+
+def guess_hard(words: tuple[str,...], history: tuple[[str, str], ...]) -> Optional[str]:
+    """ Generate the most informative guess that keeps to hard mode.
+            Parameters:
+                words(tuple<str>): tuple contains all the available vocabs
+                history (tuple<(str, str>, ...): result of update_history
+            Return
+                guess_best's guess if it fits every clue so far, or else the best of the words that do, None if there is none
+    """
+    guess = guess_best(words, history)
+    if guess is None or as_history(history).check_hard(guess) is None:
+        return guess
+    index = get_index(words)
+    allowed = index.numbers_in(index.compile(as_history(history))) #only words fitting the feedback may be guessed
+    return get_entropy_solver(len(guess)).guess(words, history, allowed)
+
+def guess_joint(histories: list[GuessHistory], length: int = WORD_LENGTH) -> Optional[str]:
+    """ Generate one guess for several boards played at once.
+            Parameters:
+                histories (list<GuessHistory>): history of each board still being played, all from the same guesses
+                length (int): number of letters in a word
+            Return
+                the guess giving the most information over all the boards, None if no board has a possible answer
+    """
+    if length not in joint_solvers: #start the solver the first time it is needed
+        joint_solvers[length] = JointSolver(get_feedback_matrix(length))
+    return joint_solvers[length].guess(histories)
+
+def get_word_lists(length: int = WORD_LENGTH) -> tuple[WordStore, WordStore]:
+    """ The word lists for words with the given number of letters.
+            Parameter:
+                length (int): 6 gives vocab.txt and answers.txt, other lengths vocab<length>.txt and answers<length>.txt
+            Return
+                (vocab, answers), neither is read until it is first used
+    """
+    if length not in word_lists:
+        word_lists[length] = (load_words(variant_file(VOCAB_FILE, length)), load_words(variant_file(ANSWERS_FILE, length)))
+    return word_lists[length]
+
+def get_feedback_matrix(length: int = WORD_LENGTH) -> FeedbackMatrix:
+    """ The feedback matrix of the vocab against the answers for one word length.
+            Return
+                the memory mapped matrix, built or brought up to date the first time it is needed
+    """
+    if length not in feedback_matrices:
+        vocab, answers = get_word_lists(length)
+        feedback_matrices[length] = load_feedback_matrix(vocab, answers, variant_file(FEEDBACK_FILE, length))
+    return feedback_matrices[length]
+
+def get_opening_book(length: int = WORD_LENGTH) -> Optional[OpeningBook]:
+    """ The solver decision tree built offline by decision_tree.py.
+            Return
+                the opening book, None if it hasn't been built for the current word lists
+    """
+    if length not in opening_books: #only look for the file once
+        vocab, answers = get_word_lists(length)
+        opening_books[length] = load_book(vocab, answers, variant_file(DECISION_TREE_FILE, length))
+    return opening_books[length]
+
+def get_entropy_solver(length: int = WORD_LENGTH) -> EntropySolver:
+    """ The entropy solver over the feedback matrix for one word length.
+            Parameter:
+                length (int): number of letters in a word
+            Return
+                the solver, started the first time it is needed
+    """
+    if length not in entropy_solvers:
+        entropy_solvers[length] = EntropySolver(get_feedback_matrix(length), variant_file(FEEDBACK_FILE, length))
+    return entropy_solvers[length]
+
+def get_difficulty(length: int = WORD_LENGTH) -> Optional[DifficultyTable]:
+    """ The difficulty of every answer, measured offline by difficulty.py.
+            Return
+                the difficulty table, None if it hasn't been measured for the current answers
+    """
+    if length not in difficulty_tables: #only look for the file once
+        difficulty_tables[length] = load_table(get_word_lists(length)[1], variant_file(DIFFICULTY_FILE, length))
+    return difficulty_tables[length]
+
+def draw_answer(length: int = WORD_LENGTH, tier: Optional[str] = None) -> str:
+    """ Draw the next answer from the shuffled deck of answers.
+            Parameter:
+                length (int): number of letters in a word
+                tier (str): if given, draw from a deck of only the answers of this difficulty (one of TIERS)
+            Return
+                an answer that has not been played since the deck was last shuffled, the position in the deck is saved between runs
+    """
+    if (length, tier) not in answer_decks: #shuffle (or resume) the deck the first time an answer is needed
+        answers = get_word_lists(length)[1]
+        if tier is not None: #each tier is dealt from its own deck, saved in its own file
+            answers = tuple(answers[i] for i in get_difficulty(length).get_tier(tier))
+        answer_decks[(length, tier)] = AnswerDeck(answers, variant_file(DECK_FILE, length, mode=tier))
+    return answer_decks[(length, tier)].draw()
 
 
 all_words = load_words('answers.txt')
 available_vocab = load_words('vocab.txt')
+#everything below is kept per word length and only built when a game of that length needs it
+word_lists = {WORD_LENGTH: (available_vocab, all_words)}
+feedback_matrices = {}
+entropy_solvers = {}
+joint_solvers = {}
+opening_books = {}
+answer_decks = {}
+difficulty_tables = {}
 
-def main():
-    #select answer_word
-    answer_word = choose_word(all_words)
-    
+def play_game(answer_word: Optional[str], adversary: Optional[AdversarialGame] = None, length: int = WORD_LENGTH, max_guesses: int = MAX_GUESSES, hard: bool = False) -> Optional[int]:
+    """ Play one round of the game against answer_word.
+            Parameter:
+                answer_word (str): the hidden word for this round, None when playing against adversary
+                adversary (AdversarialGame): if given, it chooses the feedback for each guess instead of a fixed answer
+                length (int): number of letters in a word
+                max_guesses (int): number of guesses allowed
+                hard (bool): hard mode, every guess must fit the feedback given so far
+            Return
+                the result as an index into the stats: number of guesses - 1 if won, max_guesses if lost, None if the user quit
+    """
     attempt = 1
-    guess_storage = ()
-    game_status = [0,0,0,0,0,0,0]
+    guess_storage = GuessHistory()
+    vocab = get_word_lists(length)[0]
     
-    while attempt <= 6:
+    while attempt <= max_guesses:
         #get user guess
         while True: 
-            guess_user = prompt_user(attempt, available_vocab)
+            guess_user = prompt_user(attempt, vocab, length, guess_storage if hard else None)
             if guess_user == 'q': 
                 break
             if guess_user  == 'h':
-                print('Ah, you need help? Unfortunate.')
-                guess_user = prompt_user(attempt, available_vocab) #ask for guess again
-                break
+                print_hints(guess_storage, length, hard=hard)
+                continue
             elif guess_user == 'k':
                 print_keyboard(guess_storage)
                 continue
             elif guess_user == 'a':
-                guess_user = guess_next(available_vocab, guess_storage)
+                guess_user = guess_hard(vocab, guess_storage) if hard else guess_best(vocab, guess_storage)
                 break
             else:
                 break
             
         if guess_user == 'q': #end game if user press q
-            break
+            return None
         else:
-            guess_storage = update_history(guess_storage, guess_user, answer_word) #process and update guess
+            if adversary is None:
+                guess_storage = update_history(guess_storage, guess_user, answer_word) #process and update guess
+            else:
+                guess_storage.add(guess_user, adversary.respond(guess_user)) #adversary keeps the largest group of answers
+                answer_word = adversary.get_answer() #an answer consistent with every response so far
             print_history(guess_storage) #print history 
         
         if has_won(guess_user, answer_word) == True: #compare guess with answer and check if we win
-            won_num = attempt - 1
-            game_status[won_num] = 1
             print('Correct! You won in',attempt, 'guesses!')
-            print_stats(game_status)
-            play_again = str(input('Would you like to play again (y/n)? ')) #replay? 
-            if play_again == 'y':
-                remove_word(all_words, answer_word) #delete previous answer from all_words and call main() to play
-                main()
-            elif play_again == 'n': #exit while loop and stop the game
-                break
+            return attempt - 1
         else:
             attempt += 1
             
-        if has_lost(attempt - 1) == True: #if lost condition with over 6 guessing times
+        if has_lost(attempt - 1, max_guesses) == True: #if lost condition with over max_guesses guessing times
             print('You lose! The answer was:', answer_word) 
-            game_status[attempt-1] = 1
-            print_stats(game_status)
-            play_again = str(input('Would you like to play again (y/n)? ')) #replay? 
-            if play_again == 'y':
-                remove_word(all_words, answer_word) 
-                main()
-            elif play_again == 'n': 
+            return attempt - 1
+    return None
+
+def play_boards(answer_words: list[str], length: int = WORD_LENGTH, max_guesses: int = MAX_GUESSES) -> Optional[int]:
+    """ Play one round where every guess is made on several boards at once, each hiding one of answer_words.
+            Parameter:
+                answer_words (list<str>): the hidden word of each board
+                length (int): number of letters in a word
+                max_guesses (int): number of guesses allowed to solve every board
+            Return
+                the result as an index into the stats: number of guesses - 1 if every board was solved, max_guesses if lost, None if the user quit
+    """
+    attempt = 1
+    histories = [GuessHistory() for _ in answer_words] #one history per board, a solved board stops getting guesses
+    solved = [False] * len(answer_words)
+    vocab = get_word_lists(length)[0]
+
+    while attempt <= max_guesses:
+        playing = [board for board in range(len(answer_words)) if not solved[board]]
+        #get user guess
+        while True:
+            guess_user = prompt_user(attempt, vocab, length)
+            if guess_user == 'q':
+                break
+            if guess_user == 'h':
+                for board in playing:
+                    print('\nBoard %d' %(board + 1))
+                    print_hints(histories[board], length)
+                continue
+            elif guess_user == 'k':
+                for board in playing:
+                    print('\nBoard %d' %(board + 1))
+                    print_keyboard(histories[board])
+                continue
+            elif guess_user == 'a':
+                guess_user = guess_joint([histories[board] for board in playing], length) #one guess for all the unsolved boards
                 break
+            else:
+                break
+
+        if guess_user == 'q': #end game if user press q
+            return None
+        for board in playing: #score the guess against every unsolved board
+            histories[board] = update_history(histories[board], guess_user, answer_words[board])
+            solved[board] = has_won(guess_user, answer_words[board])
+        for board in range(len(answer_words)): #print history of each board
+            print('Board %d%s' %(board + 1, ' (solved)' if solved[board] else ''))
+            print_history(histories[board])
+
+        if all(solved):
+            print('Correct! You solved all', len(answer_words), 'boards in', attempt, 'guesses!')
+            return attempt - 1
         else:
-            continue
-        
+            attempt += 1
+
+        if has_lost(attempt - 1, max_guesses) == True: #if lost condition with over max_guesses guessing times
+            print('You lose! The answers were:', ' '.join(answer_words))
+            return attempt - 1
+    return None
+
+def main(adversarial: bool = False, length: int = WORD_LENGTH, max_guesses: int = MAX_GUESSES, boards: int = 1, hard: bool = False, tier: Optional[str] = None):
+    for filename in (variant_file(VOCAB_FILE, length), variant_file(ANSWERS_FILE, length)):
+        if not os.path.exists(filename):
+            print('No %d letter word list: %s is missing' %(length, filename))
+            return
+    if tier is not None and get_difficulty(length) is None:
+        print('Answer difficulty has not been measured: run difficulty.py%s first' %('' if length == WORD_LENGTH else ' --length %d' %(length)))
+        return
+    if tier is not None and not get_difficulty(length).get_tier(tier):
+        print('No answers are rated', tier)
+        return
+    #totals of every game played with these settings, loaded from the stats files
+    #adversarial games and games of one tier are kept apart: they are harder or easier than the usual games
+    mode = 'adversarial' if adversarial else tier
+    stats_store = StatsStore(variant_file(STATS_FILE, length, max_guesses, boards, mode), variant_file(STATS_LOG_FILE, length, max_guesses, boards, mode), results=max_guesses + 1)
+    
+    while True: #one loop per game instead of calling main() again, so long sessions don't grow the stack
+        if boards > 1: #one guess for several answers at once
+            result = play_boards([draw_answer(length, tier) for _ in range(boards)], length, max_guesses)
+        elif adversarial: #the answer is only settled as the guesses come in
+            result = play_game(None, AdversarialGame(get_feedback_matrix(length), length), length, max_guesses, hard)
+        else:
+            result = play_game(draw_answer(length, tier), None, length, max_guesses, hard) #select answer_word (of the chosen difficulty, if any) and play it
+        if result is None: #user quit
+            break
+        stats_store.record(result)
+        print_stats(stats_store.get_stats())
+        play_again = str(input('Would you like to play again (y/n)? ')) #replay? 
+        if play_again != 'y': #exit the loop and stop the game
+            break
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description='Play the word guessing game.')
+    parser.add_argument('--adversarial', action='store_true', help='the answer is chosen as you guess, to be as hard as possible')
+    parser.add_argument('--length', type=int, default=WORD_LENGTH, help='number of letters in a word')
+    parser.add_argument('--guesses', type=int, help='number of guesses allowed (default: 6, plus 1 for each extra board)')
+    parser.add_argument('--boards', type=int, default=1, help='number of answers to find with the same guesses')
+    parser.add_argument('--hard', action='store_true', help='every guess must fit the feedback given so far')
+    parser.add_argument('--tier', choices=TIERS, help='only play answers of this difficulty')
+    args = parser.parse_args()
+    if not 1 <= args.length <= MAX_WORD_LENGTH:
+        parser.error('--length must be from 1 to %d' %(MAX_WORD_LENGTH))
+    if args.boards < 1 or ((args.adversarial or args.hard) and args.boards > 1):
+        parser.error('--boards must be 1 or more, and 1 with --adversarial or --hard')
+    if args.adversarial and args.tier is not None:
+        parser.error('--tier cannot be used with --adversarial')
+    main(args.adversarial, args.length, args.guesses or MAX_GUESSES + args.boards - 1, args.boards, args.hard, args.tier)
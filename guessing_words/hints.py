@@ -0,0 +1,75 @@
+from __future__ import annotations
+import heapq
+from collections import Counter
+from operator import itemgetter
+from typing import Iterator, Optional, Sequence
+
+from feedback import FeedbackMatrix
+
+HINT_COUNT = 5
+# Vocab rows scored between progress reports
+CHUNK_SIZE = 2048
+
+# (word, expected answers left after guessing it)
+Hint = tuple[str, float]
+
+
+def expected_remaining(
+    row: Sequence[int],
+    remaining: Sequence[int],
+    win_code: int
+) -> float:
+    """ Returns how many of the remaining answers are expected to still be
+        possible after a guess, given its row of the feedback matrix.
+
+    Each answer is equally likely; an answer giving feedback shared by c
+    answers leaves c of them. Guessing the answer itself leaves none.
+    """
+    total = len(remaining)
+    codes = itemgetter(*remaining)(row) if total > 1 else (row[remaining[0]],)
+    counts = Counter(codes)
+    counts.pop(win_code, None)
+    return sum(count * count for count in counts.values()) / total
+
+def iter_top_k(
+    matrix: FeedbackMatrix,
+    remaining: Sequence[int],
+    k: int = HINT_COUNT,
+    rows: Optional[Sequence[int]] = None,
+    chunk_size: int = CHUNK_SIZE
+) -> Iterator[list[Hint]]:
+    """ Scores the vocab in chunks, yielding the best k guesses found so far
+        after each chunk; the last list yielded is the final answer.
+
+    Only the k best are kept, in a bounded heap, so the vocab is never
+    sorted. Ties go to guesses that could be the answer, then vocab order.
+
+    Parameters:
+        matrix: The feedback matrix
+        remaining: Answer columns still possible
+        k: Number of guesses to return
+        rows: Vocab rows to consider (defaults to the whole vocab)
+        chunk_size: Rows scored between yields
+    """
+    vocab = matrix.get_vocab()
+    if rows is None:
+        rows = range(len(vocab))
+    if not remaining or k <= 0:
+        yield []
+        return
+    answers = matrix.get_answers()
+    possible = {answers[j] for j in remaining}
+    win_code = 3 ** len(answers[remaining[0]]) - 1
+    # Min heap whose top is the worst guess kept
+    heap = []
+    for start in range(0, len(rows), chunk_size):
+        for i in rows[start:start + chunk_size]:
+            expected = expected_remaining(matrix.row_at(i), remaining,
+                                          win_code)
+            entry = (-expected, vocab[i] in possible, -i)
+            if len(heap) < k:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+        yield [(vocab[-i], -score)
+               for score, _, i in sorted(heap, reverse=True)]
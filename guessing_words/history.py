@@ -0,0 +1,156 @@
+from __future__ import annotations
+from string import ascii_lowercase
+from typing import Iterable, Iterator, Optional
+
+from support import CORRECT, INCORRECT, UNSEEN
+
+
+class GuessHistory:
+    """ The guesses made so far and their processed forms, together with a
+        running summary of everything the feedback has revealed.
+
+        Each (guess, processed guess) pair is folded into the summary as it is
+        added, so readers never need to replay earlier guesses. Indexing and
+        iterating give the same (guess, processed guess) pairs as the tuple
+        built by update_history used to.
+    """
+    def __init__(self, entries: Iterable[tuple[str, str]] = ()) -> None:
+        """ Sets up a history, folding in any existing entries.
+
+        Parameters:
+            entries: (guess, processed guess) pairs in the order they were made
+        """
+        self._entries = []
+        self._greens = []
+        self._banned = []
+        self._min_counts = {}
+        self._max_counts = {}
+        self._letter_states = dict.fromkeys(ascii_lowercase, UNSEEN)
+        for guess, processed in entries:
+            self.add(guess, processed)
+
+    def add(self, guess: str, processed: str) -> None:
+        """ Records a guess and folds its feedback into the summary.
+
+        Parameters:
+            guess: The word guessed
+            processed: Its processed form, as returned by process_user
+        """
+        if not self._greens:
+            self._greens = [None] * len(guess)
+            self._banned = [set() for _ in guess]
+        self._entries.append((guess, processed))
+
+        found = {}
+        blacked = set()
+        for i, (letter, square) in enumerate(zip(guess, processed)):
+            if square == CORRECT:
+                self._greens[i] = letter
+            else:
+                self._banned[i].add(letter)
+            if square == INCORRECT:
+                blacked.add(letter)
+            else:
+                found[letter] = found.get(letter, 0) + 1
+        for letter in set(guess):
+            count = found.get(letter, 0)
+            if count > self._min_counts.get(letter, 0):
+                self._min_counts[letter] = count
+            if letter in blacked:
+                # A black copy means the answer has no more than were found
+                self._max_counts[letter] = min(
+                    count, self._max_counts.get(letter, count))
+
+        # The keyboard keeps the best square seen for each letter, using the
+        # last copy of a letter within a guess
+        for letter, square in dict(zip(guess, processed)).items():
+            if square > self._letter_states.get(letter, UNSEEN):
+                self._letter_states[letter] = square
+
+    def check_hard(self, guess: str) -> Optional[str]:
+        """ Returns why guess breaks hard mode (it must fit every clue given
+            so far), or None if it fits.
+
+        Only the summary is read, so the check is O(len(guess)) however many
+        guesses have been made.
+        """
+        for i, letter in enumerate(guess[:len(self._greens)]):
+            if self._greens[i] is not None and letter != self._greens[i]:
+                return '%s letter must be %s' % (_ordinal(i + 1),
+                                                 self._greens[i].upper())
+        counts = {}
+        for letter in guess:
+            counts[letter] = counts.get(letter, 0) + 1
+        for letter, count in counts.items():
+            most = self._max_counts.get(letter)
+            if most is not None and count > most:
+                if most == 0:
+                    return 'Guess cannot contain %s' % letter.upper()
+                return 'Guess can contain at most %s' % _copies(letter, most)
+        for letter, count in self._min_counts.items():
+            if counts.get(letter, 0) < count:
+                return 'Guess must contain %s' % _copies(letter, count)
+        for i, letter in enumerate(guess[:len(self._banned)]):
+            if letter in self._banned[i]:
+                return '%s letter cannot be %s' % (_ordinal(i + 1),
+                                                   letter.upper())
+        return None
+
+    def get_greens(self) -> list[Optional[str]]:
+        """ Returns the letter fixed at each position, None if not yet known.
+        """
+        return self._greens
+
+    def get_banned(self) -> list[set[str]]:
+        """ Returns the letters known not to be at each position. """
+        return self._banned
+
+    def get_min_counts(self) -> dict[str, int]:
+        """ Returns the fewest copies of each letter the answer can have. """
+        return self._min_counts
+
+    def get_max_counts(self) -> dict[str, int]:
+        """ Returns the most copies of a letter the answer can have, for the
+            letters where that is known.
+        """
+        return self._max_counts
+
+    def get_letter_states(self) -> dict[str, str]:
+        """ Returns the best square seen for every letter of the alphabet. """
+        return self._letter_states
+
+    def __len__(self) -> int:
+        """ Returns the number of guesses made. """
+        return len(self._entries)
+
+    def __getitem__(self, index):
+        """ Returns the (guess, processed guess) pair(s) at index. """
+        return self._entries[index]
+
+    def __iter__(self) -> Iterator[tuple[str, str]]:
+        """ Iterates over (guess, processed guess) pairs in order. """
+        return iter(self._entries)
+
+    def __repr__(self) -> str:
+        """ Returns the computer representation of this history. """
+        return f"GuessHistory({self._entries!r})"
+
+
+def _ordinal(n: int) -> str:
+    """ Returns 1st, 2nd, 3rd, 4th ... for n. """
+    suffix = 'th' if 10 <= n % 100 <= 20 else {1: 'st', 2: 'nd', 3: 'rd'}.get(
+        n % 10, 'th')
+    return '%d%s' % (n, suffix)
+
+def _copies(letter: str, count: int) -> str:
+    """ Returns 'E' for one copy of e, '2 Es' for two. """
+    if count == 1:
+        return letter.upper()
+    return '%d %ss' % (count, letter.upper())
+
+def as_history(history: Iterable[tuple[str, str]]) -> GuessHistory:
+    """ Returns history as a GuessHistory, folding it if it is a plain tuple.
+    """
+    if isinstance(history, GuessHistory):
+        return history
+    return GuessHistory(history)
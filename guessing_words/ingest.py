@@ -0,0 +1,183 @@
+from __future__ import annotations
+import argparse
+import bz2
+import gzip
+import heapq
+import lzma
+import os
+import sys
+import tempfile
+import time
+from string import ascii_lowercase
+from typing import IO, Iterable, Iterator, Optional, Sequence
+
+from support import WORD_LENGTH
+from word_store import compiled_name, write_compiled
+
+# Most words held in memory at once while deduplicating; bigger inputs are
+# sorted in runs of this size on disk and merged
+RUN_SIZE = 1_000_000
+
+OPENERS = {
+    '.gz': gzip.open,
+    '.xz': lzma.open,
+    '.bz2': bz2.open,
+}
+
+
+def open_source(filename: str) -> IO[str]:
+    """ Opens a word list as text, decompressing it on the fly if its
+        extension is .gz, .xz or .bz2.
+    """
+    opener = OPENERS.get(os.path.splitext(filename)[1], open)
+    return opener(filename, 'rt', encoding='utf-8', errors='replace')
+
+def read_lines(filenames: Iterable[str]) -> Iterator[str]:
+    """ Yields every line of every file in turn. """
+    for filename in filenames:
+        with open_source(filename) as file:
+            yield from file
+
+def normalise(lines: Iterable[str]) -> Iterator[str]:
+    """ Yields each line stripped and lowercased. """
+    for line in lines:
+        yield line.strip().lower()
+
+def keep(
+    words: Iterable[str],
+    length: int,
+    alphabet: str = ascii_lowercase
+) -> Iterator[str]:
+    """ Yields the words with exactly length letters, all from alphabet. """
+    for word in words:
+        if len(word) == length and not word.strip(alphabet):
+            yield word
+
+def _write_run(words: list[str], directory: str) -> str:
+    """ Writes one sorted run of distinct words, returning its path. """
+    with tempfile.NamedTemporaryFile('w', dir=directory, suffix='.run',
+                                     delete=False) as run:
+        for word in sorted(set(words)):
+            run.write(word + '\n')
+    return run.name
+
+def _read_run(filename: str) -> Iterator[str]:
+    """ Yields the words of a run. """
+    with open(filename, 'r') as run:
+        for line in run:
+            yield line[:-1]
+
+def dedupe(
+    words: Iterable[str],
+    run_size: int = RUN_SIZE,
+    directory: Optional[str] = None
+) -> Iterator[str]:
+    """ Yields each distinct word once, in alphabetical order.
+
+    At most run_size words are held at once: if there are more, each batch is
+    sorted into a temporary run file and the runs are merged.
+
+    Parameters:
+        words: The words, in any order, with repeats
+        run_size: Largest batch sorted in memory
+        directory: Where run files go (defaults to the system temp directory)
+    """
+    runs = []
+    batch = []
+    try:
+        for word in words:
+            batch.append(word)
+            if len(batch) >= run_size:
+                runs.append(_write_run(batch, directory))
+                batch = []
+        if not runs:
+            yield from sorted(set(batch))
+            return
+        if batch:
+            runs.append(_write_run(batch, directory))
+            batch = []
+        previous = None
+        for word in heapq.merge(*(_read_run(run) for run in runs)):
+            if word != previous:
+                yield word
+                previous = word
+    finally:
+        for run in runs:
+            os.remove(run)
+
+def ingest(
+    sources: Sequence[str],
+    target: str,
+    length: int = WORD_LENGTH,
+    alphabet: str = ascii_lowercase,
+    run_size: int = RUN_SIZE
+) -> tuple[int, int]:
+    """ Builds a word list and its compiled dictionary from external lists.
+
+    The sources are streamed through decompression, lowercasing, the length
+    and alphabet filter and deduplication into target (one word per line, in
+    alphabetical order), which is then compiled as WordStore expects.
+
+    Parameters:
+        sources: Word lists, one word per line, optionally compressed
+        target: The text word list to write, e.g. vocab5.txt
+        length: Number of letters the words must have
+        alphabet: Letters the words may use
+        run_size: Largest batch sorted in memory while deduplicating
+
+    Returns:
+        (lines read, words written)
+    """
+    read = 0
+
+    def counted(lines: Iterable[str]) -> Iterator[str]:
+        nonlocal read
+        for read, line in enumerate(lines, 1):
+            yield line
+
+    words = dedupe(keep(normalise(counted(read_lines(sources))), length,
+                        alphabet), run_size,
+                   os.path.dirname(os.path.abspath(target)))
+    temp_name = target + '.tmp'
+    with open(temp_name, 'w') as file:
+        for word in words:
+            file.write(word + '\n')
+    os.replace(temp_name, target)
+
+    stat = os.stat(target)
+    with open(target, 'r') as file:
+        # Records are bytes, and a letter outside ASCII takes several
+        width = length * max((len(letter.encode()) for letter in alphabet),
+                             default=1)
+        written = write_compiled((line[:-1] for line in file), width,
+                                 compiled_name(target), stat.st_size,
+                                 stat.st_mtime_ns, ordered=True)
+    return read, written
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description='Build a word list from large, possibly compressed, '
+                    'dictionaries.')
+    parser.add_argument('sources', nargs='+',
+                        help='word lists (.gz, .xz and .bz2 are decompressed)')
+    parser.add_argument('-o', '--output', required=True,
+                        help='text word list to write, e.g. vocab5.txt')
+    parser.add_argument('--length', type=int, default=WORD_LENGTH)
+    parser.add_argument('--alphabet', default=ascii_lowercase)
+    parser.add_argument('--run-size', type=int, default=RUN_SIZE,
+                        help='words sorted in memory at once')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    read, written = ingest(args.sources, args.output, args.length,
+                           args.alphabet, args.run_size)
+    elapsed = time.perf_counter() - start
+    print('Wrote %d words to %s' % (written, args.output))
+    print('Read %d lines in %.2fs (%.0f lines/s)'
+          % (read, elapsed, read / elapsed if elapsed else 0.0),
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+from __future__ import annotations
+import argparse
+import asyncio
+import time
+from random import Random
+from typing import Optional, Sequence
+
+import gaming
+from support import CORRECT, MAX_GUESSES
+from server import GameServer, HOST
+
+
+def percentile(ordered: Sequence[float], fraction: float) -> float:
+    """ Returns the value at fraction (0-1) of an already sorted list. """
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+async def _client(
+    host: str,
+    port: int,
+    turns: int,
+    words: Sequence[str],
+    seed: int,
+    latencies: list[float]
+) -> None:
+    """ One simulated player: makes random valid guesses, timing each turn
+        from sending the guess to reading its processed form.
+    """
+    random = Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        if (await reader.readline()).strip() != b'READY':
+            return
+        guesses = 0
+        for _ in range(turns):
+            start = time.perf_counter()
+            writer.write(random.choice(words).encode() + b'\n')
+            await writer.drain()
+            processed = (await reader.readline()).decode().strip()
+            latencies.append(time.perf_counter() - start)
+            guesses += 1
+            if processed == CORRECT * len(processed) \
+                    or guesses == MAX_GUESSES:
+                # WON / LOST, then READY for the next game
+                await reader.readline()
+                await reader.readline()
+                guesses = 0
+        writer.write(b'q\n')
+        await writer.drain()
+        await reader.readline()
+    finally:
+        writer.close()
+
+async def run_load(
+    host: str,
+    port: int,
+    clients: int,
+    turns: int,
+    seed: int = 0
+) -> tuple[list[float], float]:
+    """ Runs concurrent simulated players against a server.
+
+    Parameters:
+        host, port: Where the server is listening
+        clients: Number of players connected at once
+        turns: Guesses each player makes
+        seed: Seed for the players' guesses
+
+    Returns:
+        The sorted turn latencies in seconds, and the wall clock time taken
+    """
+    words = tuple(gaming.available_vocab)
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, turns, words, seed + i,
+                                   latencies)
+                           for i in range(clients)))
+    return sorted(latencies), time.perf_counter() - start
+
+async def _run_local(clients: int, turns: int, seed: int) -> tuple[list[float], float]:
+    """ Starts a server on a free localhost port and loads it. """
+    server = await GameServer().start(HOST, 0)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        return await run_load(HOST, port, clients, turns, seed)
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description='Simulate many players against the game server.')
+    parser.add_argument('--clients', type=int, default=1000)
+    parser.add_argument('--turns', type=int, default=20,
+                        help='guesses made by each client')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--port', type=int,
+                        help='load a running server on this port instead of '
+                             'starting one in process')
+    parser.add_argument('--host', default=HOST)
+    args = parser.parse_args(argv)
+
+    if args.port is None:
+        latencies, elapsed = asyncio.run(
+            _run_local(args.clients, args.turns, args.seed))
+    else:
+        latencies, elapsed = asyncio.run(
+            run_load(args.host, args.port, args.clients, args.turns,
+                     args.seed))
+
+    print('Clients: %d  Turns: %d  Time: %.2fs  (%.0f turns/s)'
+          % (args.clients, len(latencies), elapsed,
+             len(latencies) / elapsed if elapsed else 0))
+    print('Turn latency p50: %.2fms  p99: %.2fms  max: %.2fms'
+          % (percentile(latencies, 0.5) * 1000,
+             percentile(latencies, 0.99) * 1000,
+             percentile(latencies, 1.0) * 1000))
+
+
+if __name__ == "__main__":
+    main()
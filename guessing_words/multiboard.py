@@ -0,0 +1,111 @@
+from __future__ import annotations
+from collections import Counter
+from typing import Optional, Sequence
+
+from feedback import FeedbackMatrix, encode_pattern
+from solver import Memo, entropy
+
+# One history per board, all made from the same guesses. A solved board's
+# history stops at the guess that solved it.
+Histories = Sequence[Sequence[tuple[str, str]]]
+
+
+def remaining_per_board(
+    matrix: FeedbackMatrix,
+    histories: Histories
+) -> list[list[int]]:
+    """ Returns the answer columns consistent with each board's history.
+
+    The boards share their guesses, so each guess's matrix row is read once
+    and used to filter every board still playing at that turn.
+
+    Parameters:
+        matrix: The feedback matrix
+        histories: One history per board, as built by update_history
+    """
+    remaining = [list(range(len(matrix.get_answers())))
+                 for _ in histories]
+    turns = max((len(history) for history in histories), default=0)
+    for turn in range(turns):
+        guess = row = None
+        for board, history in enumerate(histories):
+            if turn >= len(history):
+                continue
+            if history[turn][0] != guess:
+                guess = history[turn][0]
+                row = matrix.row(guess)
+            code = encode_pattern(history[turn][1])
+            remaining[board] = [j for j in remaining[board] if row[j] == code]
+    return remaining
+
+def best_joint(
+    matrix: FeedbackMatrix,
+    rows: Sequence[int],
+    boards: Counter
+) -> tuple[tuple[float, bool, int], int]:
+    """ Returns (score, row) of the best guess among rows for all boards.
+
+    A guess scores the total of its entropy on each board. Boards with the
+    same answers left (every board, at the start) are scored once and
+    weighted by how many there are. Ties go to guesses that could be an
+    answer, then to vocab order, as in best_in.
+
+    Parameters:
+        matrix: The feedback matrix
+        rows: Candidate vocab rows
+        boards: Map of answer columns left on a board to how many boards
+            have exactly those left
+    """
+    answers = matrix.get_answers()
+    possible = {answers[j] for remaining in boards for j in remaining}
+    vocab = matrix.get_vocab()
+    best = None
+    for i in rows:
+        row = matrix.row_at(i)
+        score = sum(weight * entropy(row, remaining)
+                    for remaining, weight in boards.items())
+        key = (round(score, 9), vocab[i] in possible, -i)
+        if best is None or key > best[0]:
+            best = (key, i)
+    return best
+
+
+class JointSolver:
+    """ Picks one guess for several boards at once, each hiding a different
+        answer, by maximising the information it gives across all of them.
+    """
+    def __init__(self, matrix: FeedbackMatrix) -> None:
+        """ Sets up a solver over a feedback matrix.
+
+        Parameters:
+            matrix: The feedback matrix for the vocab and answers
+        """
+        self._matrix = matrix
+        self._known = Memo()
+
+    def guess(self, histories: Histories) -> Optional[str]:
+        """ Returns the best guess for the boards still being played, or None
+            if no board has an answer consistent with its history.
+
+        A board down to one answer is played straight away, since that guess
+        is sure to solve it.
+
+        Parameters:
+            histories: One history per unsolved board
+        """
+        boards = [remaining for remaining in
+                  remaining_per_board(self._matrix, histories) if remaining]
+        if not boards:
+            return None
+        answers = self._matrix.get_answers()
+        smallest = min(boards, key=len)
+        if len(smallest) == 1:
+            return answers[smallest[0]]
+        weights = Counter(tuple(remaining) for remaining in boards)
+        key = frozenset(weights.items())
+        row = self._known.get(key)
+        if row is None:
+            row = best_joint(self._matrix,
+                             range(len(self._matrix.get_vocab())), weights)[1]
+            self._known.put(key, row)
+        return self._matrix.get_vocab()[row]
@@ -0,0 +1,46 @@
+from __future__ import annotations
+import struct
+
+# A node is (value, {edge label: child node}), as kept by the decision tree
+# and the BK-tree.
+Node = tuple[int, dict[int, 'Node']]
+
+
+def write_node(
+    node: Node,
+    out: list[bytes],
+    node_format: struct.Struct,
+    edge_format: struct.Struct
+) -> None:
+    """ Appends node and its subtree to out in preorder: the node's value and
+        child count, then each child's edge label followed by the child.
+
+    Parameters:
+        node: The root of the subtree
+        out: The chunks written so far
+        node_format: Packs a value and a child count
+        edge_format: Packs an edge label
+    """
+    value, children = node
+    out.append(node_format.pack(value, len(children)))
+    for edge, child in sorted(children.items()):
+        out.append(edge_format.pack(edge))
+        write_node(child, out, node_format, edge_format)
+
+def read_node(
+    data: bytes,
+    offset: int,
+    node_format: struct.Struct,
+    edge_format: struct.Struct
+) -> tuple[Node, int]:
+    """ Reads a subtree written by write_node, returning it and the offset
+        after it.
+    """
+    value, count = node_format.unpack_from(data, offset)
+    offset += node_format.size
+    children = {}
+    for _ in range(count):
+        (edge,) = edge_format.unpack_from(data, offset)
+        children[edge], offset = read_node(data, offset + edge_format.size,
+                                           node_format, edge_format)
+    return (value, children), offset
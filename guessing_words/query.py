@@ -0,0 +1,155 @@
+from __future__ import annotations
+import argparse
+import sys
+import time
+from typing import Optional, Sequence
+
+from support import VOCAB_FILE, load_words
+from word_index import WordIndex, get_index
+
+WILDCARDS = '?._'
+# Most matches printed by the CLI
+LIMIT = 50
+COMPARISONS = ('>=', '<=', '=')
+
+
+class Query:
+    """ A pattern query: letters fixed at positions, and the least and most
+        times each letter may appear.
+
+        Written as space separated terms:
+            c?a??n   the word's letters, ? (or . or _) for any letter
+            +r       r appears at least once (+rr: at least twice)
+            -e       e does not appear (-xyz: none of x, y and z)
+            r=2      r appears exactly twice (also r>=2, r<=1)
+    """
+    def __init__(self, text: str) -> None:
+        """ Parses a query.
+
+        Parameters:
+            text: The query terms
+
+        Raises:
+            ValueError: If a term is not understood
+        """
+        self._fixed = None
+        self._min_counts = {}
+        self._max_counts = {}
+        for term in text.lower().split():
+            if term[0] == '+' and term[1:].isalpha():
+                for letter in set(term[1:]):
+                    self._at_least(letter, term.count(letter))
+            elif term[0] == '-' and term[1:].isalpha():
+                for letter in term[1:]:
+                    self._at_most(letter, 0)
+            elif any(symbol in term for symbol in COMPARISONS):
+                self._count(term)
+            elif all(letter.isalpha() or letter in WILDCARDS
+                      for letter in term):
+                if self._fixed is not None:
+                    raise ValueError('more than one pattern: %s' % term)
+                self._fixed = [None if letter in WILDCARDS else letter
+                               for letter in term]
+            else:
+                raise ValueError('unknown term: %s' % term)
+
+    def _at_least(self, letter: str, count: int) -> None:
+        """ Requires letter at least count times. """
+        self._min_counts[letter] = max(self._min_counts.get(letter, 0), count)
+
+    def _at_most(self, letter: str, count: int) -> None:
+        """ Allows letter at most count times. """
+        self._max_counts[letter] = min(self._max_counts.get(letter, count),
+                                       count)
+
+    def _count(self, term: str) -> None:
+        """ Reads a letter count term such as r>=2. """
+        for symbol in COMPARISONS:
+            letter, found, count = term.partition(symbol)
+            if found:
+                break
+        if len(letter) != 1 or not letter.isalpha() or not count.isdigit():
+            raise ValueError('bad letter count: %s' % term)
+        if symbol != '<=':
+            self._at_least(letter, int(count))
+        if symbol != '>=':
+            self._at_most(letter, int(count))
+
+    def mask(self, index: WordIndex) -> int:
+        """ Returns the mask of indexed words matching the query. """
+        words = index.get_words()
+        if self._fixed is not None and words \
+                and len(self._fixed) != len(words[0]):
+            return 0
+        mask = index.all_words()
+        for position, letter in enumerate(self._fixed or ()):
+            if letter is not None:
+                mask &= index.with_letter_at(position, letter)
+        for letter, count in self._min_counts.items():
+            mask &= index.with_at_least(letter, count)
+        for letter, count in self._max_counts.items():
+            mask &= ~index.with_at_least(letter, count + 1)
+        return mask
+
+    def __repr__(self) -> str:
+        """ Returns the computer representation of this query. """
+        pattern = ''.join(letter or '?' for letter in self._fixed or ())
+        return (f"Query({pattern!r}, min={self._min_counts}, "
+                f"max={self._max_counts})")
+
+
+def find(words: Sequence[str], text: str) -> list[str]:
+    """ Returns the words matching a query, in word list order.
+
+    The bitset index of words is built (or loaded) the first time it is
+    queried and reused afterwards.
+
+    Parameters:
+        words: The words to search
+        text: The query, in the syntax described by Query
+
+    Raises:
+        ValueError: If the query is not understood
+    """
+    index = get_index(words)
+    return index.words_in(Query(text).mask(index))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description='Find words matching a pattern, e.g. "c?a??n +r -e". '
+                    'With no query, one query is read per line of input.',
+        add_help=False)
+    # Only --help, so -h is left to mean "no h" like any other letter
+    parser.add_argument('--help', action='help',
+                        help='show this help message and exit')
+    parser.add_argument('query', nargs='*', help='query terms')
+    parser.add_argument('--words', default=VOCAB_FILE,
+                        help='word list to search (default: %(default)s)')
+    parser.add_argument('--limit', type=int, default=LIMIT,
+                        help='most matches to print (0 for all)')
+    # Excluded letters (-e) look like options, so leftovers are query terms
+    args, terms = parser.parse_known_args(argv)
+    terms = args.query + terms
+
+    words = load_words(args.words)
+    get_index(words)
+    queries = [' '.join(terms)] if terms else sys.stdin
+    for text in queries:
+        if not text.strip():
+            continue
+        start = time.perf_counter()
+        try:
+            found = find(words, text)
+        except ValueError as error:
+            print('Invalid query:', error)
+            continue
+        elapsed = time.perf_counter() - start
+        shown = found[:args.limit] if args.limit else found
+        print(' '.join(shown) + (' ...' if len(shown) < len(found) else ''))
+        print('%d matches in %.3fms' % (len(found), elapsed * 1000),
+              file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+""" Slow, obvious implementations the tests check the fast code against. """
+from __future__ import annotations
+from collections import Counter
+from random import Random
+from typing import Iterable, Sequence
+
+from feedback import decode_pattern, encode_pattern
+from history import GuessHistory
+
+
+def reference_score(guess: str, answer: str) -> int:
+    """ Scores guess against answer the slow, obvious way: greens first,
+        then yellows left to right while unmatched copies remain.
+    """
+    squares = [0] * len(guess)
+    unmatched = Counter(answer)
+    for i, (g, a) in enumerate(zip(guess, answer)):
+        if g == a:
+            squares[i] = 2
+            unmatched[g] -= 1
+    for i, g in enumerate(guess):
+        if squares[i] == 0 and unmatched[g] > 0:
+            squares[i] = 1
+            unmatched[g] -= 1
+    code = 0
+    for square in squares:
+        code = code * 3 + square
+    return code
+
+
+def random_history(rng: Random, vocab: Sequence[str],
+                   answers: Sequence[str]) -> GuessHistory:
+    """ Returns the history of one to three random guesses at a random
+        answer.
+    """
+    answer = rng.choice(answers)
+    return GuessHistory(
+        (guess, decode_pattern(reference_score(guess, answer)))
+        for guess in rng.sample(vocab, rng.randint(1, 3)))
+
+def fits(history: Iterable[tuple[str, str]], word: str) -> bool:
+    """ Returns True iff word, as the answer, gives every clue in history. """
+    return all(reference_score(guess, word) == encode_pattern(processed)
+               for guess, processed in history)
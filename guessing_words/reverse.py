@@ -0,0 +1,122 @@
+from __future__ import annotations
+import sys
+import time
+from typing import Optional, Sequence
+
+from feedback import FeedbackMatrix, DIGITS
+from support import CORRECT, MISPLACED, INCORRECT
+
+# Other squares found in shared grids: the light theme's blank square and the
+# high contrast colours
+ALIASES = {
+    '⬜': INCORRECT,      # white square
+    '\U0001f7e7': CORRECT,    # orange square
+    '\U0001f7e6': MISPLACED,  # blue square
+}
+
+
+def parse_row(line: str) -> Optional[tuple[int, int]]:
+    """ Returns the pattern code of one row of a shared grid and its number
+        of squares, or None if the line is not a row of squares (a title
+        line, say).
+    """
+    code = 0
+    length = 0
+    for square in line.strip():
+        square = ALIASES.get(square, square)
+        if square not in DIGITS:
+            return None
+        code = code * 3 + DIGITS[square]
+        length += 1
+    return (code, length) if length else None
+
+
+class ReverseIndex:
+    """ Finds the answers a shared grid of patterns could have come from,
+        without knowing the guesses.
+
+        For every pattern code the index keeps a bitset of the answers that
+        some vocab word scores that pattern against, read once from the
+        feedback matrix. The answers fitting a grid are the AND of the
+        bitsets of its rows.
+    """
+    def __init__(self, matrix: FeedbackMatrix) -> None:
+        """ Builds the index from the matrix's columns.
+
+        Parameters:
+            matrix: The feedback matrix for the vocab and answers
+        """
+        self._matrix = matrix
+        self._all = (1 << len(matrix.get_answers())) - 1
+        self._answers_with = {}
+        for j in range(len(matrix.get_answers())):
+            bit = 1 << j
+            for code in set(matrix.column_at(j)):
+                self._answers_with[code] = self._answers_with.get(code, 0) | bit
+
+    def mask(self, codes: Sequence[int]) -> int:
+        """ Returns the bitset of answer columns that could give every one of
+            the pattern codes, each to some guess.
+        """
+        mask = self._all
+        for code in codes:
+            mask &= self._answers_with.get(code, 0)
+        return mask
+
+    def answers_for(self, codes: Sequence[int]) -> list[str]:
+        """ Returns the answers consistent with a grid, in answer order.
+
+        Parameters:
+            codes: The pattern code of each row of the grid
+        """
+        answers = self._matrix.get_answers()
+        mask = self.mask(codes)
+        return [answers[j] for j in range(len(answers)) if mask >> j & 1]
+
+    def guesses_for(
+        self,
+        answer: str,
+        codes: Sequence[int]
+    ) -> list[Optional[str]]:
+        """ Returns, for each row, the first vocab word that scores that
+            pattern against answer (None if there is none).
+        """
+        column = self._matrix.column_at(self._matrix.answer_index(answer))
+        vocab = self._matrix.get_vocab()
+        rows = {}
+        for i, code in enumerate(column):
+            rows.setdefault(code, i)
+        return [vocab[rows[code]] if code in rows else None for code in codes]
+
+
+def main() -> None:
+    import gaming
+
+    rows = [row for row in map(parse_row, sys.stdin) if row is not None]
+    if not rows:
+        print('Paste the rows of squares of a grid, one per line.')
+        return
+    matrix = gaming.get_feedback_matrix()
+    length = len(matrix.get_answers()[0])
+    wrong = [squares for _, squares in rows if squares != length]
+    if wrong:
+        print('Every row needs %d squares, one per letter, not %d.'
+              % (length, wrong[0]))
+        return
+    codes = [code for code, _ in rows]
+    start = time.perf_counter()
+    index = ReverseIndex(matrix)
+    built = time.perf_counter()
+    found = index.answers_for(codes)
+    print('%d possible answers:' % len(found), ' '.join(found))
+    if len(found) == 1:
+        print('Guesses that fit:',
+              ' '.join(guess or '?' for guess in
+                       index.guesses_for(found[0], codes)))
+    print('Index built in %.1fms, query took %.3fms'
+          % ((built - start) * 1000, (time.perf_counter() - built) * 1000),
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+from __future__ import annotations
+import argparse
+import asyncio
+from typing import Optional
+
+import gaming
+from autocomplete import complete, get_trie
+from deck import AnswerDeck
+from history import GuessHistory
+from solver_cache import SolverCache
+from support import WORD_LENGTH, SOLVER_CACHE_FILE
+
+HOST = '127.0.0.1'
+PORT = 8646
+# Seconds a client may sit idle before its session is closed
+IDLE_TIMEOUT = 300.0
+# Longest accepted request line, in bytes; a guess or command is far shorter
+MAX_LINE = 64
+MAX_SESSIONS = 10000
+# Pending connections the OS may queue, so bursts of clients aren't dropped
+BACKLOG = 4096
+
+
+class GameSession:
+    """ The state of one connected player: the current answer and the guesses
+        made against it.
+
+        A session only ever holds one game's history (at most six entries),
+        so its memory is bounded however long the client stays.
+    """
+    def __init__(
+        self,
+        deck: AnswerDeck,
+        hints: SolverCache,
+        hard: bool = False
+    ) -> None:
+        """ Starts a session with a fresh game.
+
+        Parameters:
+            deck: Where answers for new games are drawn from
+            hints: The solver cache shared by every session
+            hard: Whether every guess must fit the feedback given so far
+        """
+        self._deck = deck
+        self._hints = hints
+        self._hard = hard
+        self._games = 0
+        self.new_game()
+
+    def new_game(self) -> None:
+        """ Draws a new answer and clears the history. """
+        self._answer = self._deck.draw()
+        self._history = GuessHistory()
+        self._games += 1
+
+    def get_history(self) -> GuessHistory:
+        """ Returns the guesses made in the current game. """
+        return self._history
+
+    def handle(self, line: str) -> tuple[list[str], bool]:
+        """ Runs one request line through the game.
+
+        Protocol (one request per line, one or more reply lines):
+            <guess>  -> <processed guess>, then WON <n> or LOST <answer>
+                        followed by READY when the game ends
+                     -> INVALID <reason> if the guess is not accepted
+            a        -> SUGGEST <word> from the solver
+            ?<start> -> COMPLETE <word> ... valid guesses starting with
+                        <start>, for autocomplete while typing (in hard
+                        mode, only those fitting the feedback so far)
+            q        -> BYE, and the connection is closed
+
+        Returns:
+            The reply lines and whether the connection should be closed
+        """
+        guess = line.strip().lower()
+        if guess == 'q':
+            return ['BYE'], True
+        if guess == 'a':
+            suggestion = self._hints.guess(self._history)
+            return ['SUGGEST %s' % suggestion], False
+        if guess.startswith('?'):
+            completions = complete(gaming.available_vocab, guess[1:],
+                                   self._history if self._hard else None)
+            return [' '.join(['COMPLETE'] + completions)], False
+        if len(guess) != WORD_LENGTH:
+            return ['INVALID Guess must be of length %d' % WORD_LENGTH], False
+        if guess not in gaming.available_vocab:
+            return ['INVALID Unknown word'], False
+        if self._hard:
+            reason = self._history.check_hard(guess)
+            if reason is not None:
+                return ['INVALID %s' % reason], False
+
+        gaming.update_history(self._history, guess, self._answer)
+        replies = [self._history[-1][1]]
+        if gaming.has_won(guess, self._answer):
+            replies.append('WON %d' % len(self._history))
+        elif gaming.has_lost(len(self._history)):
+            replies.append('LOST %s' % self._answer)
+        else:
+            return replies, False
+        self.new_game()
+        replies.append('READY')
+        return replies, False
+
+
+class GameServer:
+    """ Hosts many independent game sessions over a TCP line protocol. """
+    def __init__(
+        self,
+        idle_timeout: float = IDLE_TIMEOUT,
+        max_sessions: int = MAX_SESSIONS,
+        cache_file: Optional[str] = None,
+        hard: bool = False
+    ) -> None:
+        """ Sets up the server; answers are dealt from one shared deck and
+            suggestions come from one shared solver cache.
+
+        Parameters:
+            idle_timeout: Seconds to wait for a request before hanging up
+            max_sessions: Most sessions open at once; extra clients are
+                          turned away
+            cache_file: Where the solver cache is kept between runs, None to
+                        start cold every time
+            hard: Whether sessions are played in hard mode
+        """
+        self._deck = AnswerDeck(gaming.all_words, None)
+        self._hints = SolverCache(gaming.guess_next, gaming.available_vocab,
+                                  filename=cache_file)
+        self._idle_timeout = idle_timeout
+        self._max_sessions = max_sessions
+        self._sessions = 0
+        self._hard = hard
+
+    def session_count(self) -> int:
+        """ Returns the number of connected sessions. """
+        return self._sessions
+
+    def get_hints(self) -> SolverCache:
+        """ Returns the solver cache behind the a command. """
+        return self._hints
+
+    async def _serve(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter
+    ) -> None:
+        """ Runs one client's session until it quits, times out or errors. """
+        if self._sessions >= self._max_sessions:
+            writer.write(b'BUSY\n')
+            await writer.drain()
+            writer.close()
+            return
+        self._sessions += 1
+        try:
+            session = GameSession(self._deck, self._hints, self._hard)
+            writer.write(b'READY\n')
+            await writer.drain()
+            while True:
+                try:
+                    line = await asyncio.wait_for(reader.readline(),
+                                                  self._idle_timeout)
+                except asyncio.TimeoutError:
+                    writer.write(b'TIMEOUT\n')
+                    break
+                except (ValueError, asyncio.LimitOverrunError):
+                    writer.write(b'ERROR Line too long\n')
+                    break
+                if not line:
+                    break
+                replies, done = session.handle(line.decode(errors='replace'))
+                writer.write(('\n'.join(replies) + '\n').encode())
+                try:
+                    # A client that stops reading would otherwise hold the
+                    # session open with its replies buffered forever
+                    await asyncio.wait_for(writer.drain(), self._idle_timeout)
+                except asyncio.TimeoutError:
+                    break
+                if done:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self._sessions -= 1
+            writer.close()
+
+    async def start(
+        self,
+        host: str = HOST,
+        port: int = PORT
+    ) -> asyncio.AbstractServer:
+        """ Starts listening; returns the asyncio server. """
+        # Preload the words so the first client doesn't pay for it
+        len(gaming.available_vocab), len(gaming.all_words)
+        get_trie(gaming.available_vocab)
+        return await asyncio.start_server(self._serve, host, port,
+                                          limit=MAX_LINE, backlog=BACKLOG)
+
+    async def run(self, host: str = HOST, port: int = PORT) -> None:
+        """ Serves until cancelled, then saves the solver cache. """
+        server = await self.start(host, port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self._hints.save()
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description='Host the word guessing game over TCP.')
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--timeout', type=float, default=IDLE_TIMEOUT,
+                        help='seconds before an idle session is closed')
+    parser.add_argument('--max-sessions', type=int, default=MAX_SESSIONS)
+    parser.add_argument('--cache', default=SOLVER_CACHE_FILE,
+                        help='file keeping solver results between runs '
+                             '(empty to keep them in memory only)')
+    parser.add_argument('--hard', action='store_true',
+                        help='every guess must fit the feedback given so far')
+    args = parser.parse_args(argv)
+
+    server = GameServer(args.timeout, args.max_sessions, args.cache or None,
+                        args.hard)
+    print('Serving on %s:%d' % (args.host, args.port))
+    try:
+        asyncio.run(server.run(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    print('Solver cache:', server.get_hints())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+from __future__ import annotations
+import argparse
+import csv
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from random import Random
+from typing import Callable, Optional, Sequence
+
+import gaming
+from support import (
+    ANSWERS_FILE,
+    FEEDBACK_FILE,
+    MAX_GUESSES,
+    MAX_WORD_LENGTH,
+    VOCAB_FILE,
+    WORD_LENGTH,
+    variant_file,
+)
+from solver import EntropySolver
+
+SOLVERS = {
+    'next': 'guess_next',
+    'best': 'guess_best',
+}
+
+# (answer, guesses made in order, won)
+Result = tuple[str, tuple[str, ...], bool]
+
+
+def play(
+    solver: Callable[[Sequence[str], tuple], Optional[str]],
+    answer: str,
+    words: Sequence[str]
+) -> Result:
+    """ Plays one game of solver against answer without any input or output.
+
+    Parameters:
+        solver: A guess_next style function taking (words, history)
+        answer: The hidden word
+        words: The guessable words passed to solver
+
+    Returns:
+        (answer, guesses made, whether the game was won)
+    """
+    history = ()
+    while len(history) < MAX_GUESSES:
+        guess = solver(words, history)
+        if guess is None:
+            break
+        history = gaming.update_history(history, guess, answer)
+        if gaming.has_won(guess, answer):
+            return answer, tuple(guess for guess, _ in history), True
+    return answer, tuple(guess for guess, _ in history), False
+
+def init_worker(length: int) -> None:
+    """ Keeps each simulation process to a single solver process. """
+    gaming.entropy_solvers[length] = EntropySolver(
+        gaming.get_feedback_matrix(length),
+        variant_file(FEEDBACK_FILE, length), workers=1)
+
+def _play_all(solver_name: str, answers: Sequence[str]) -> list[Result]:
+    """ Pool task: plays every answer in one shard. """
+    solver = getattr(gaming, SOLVERS[solver_name])
+    words = gaming.get_word_lists(len(answers[0]))[0]
+    return [play(solver, answer, words) for answer in answers]
+
+def simulate(
+    solver_name: str,
+    answers: Sequence[str],
+    workers: Optional[int] = None,
+    length: int = WORD_LENGTH
+) -> list[Result]:
+    """ Plays solver against every answer, sharding games across processes.
+
+    Parameters:
+        solver_name: A key of SOLVERS
+        answers: The answers to play against
+        workers: Number of processes (defaults to the CPU count)
+        length: Number of letters in the answers
+
+    Returns:
+        One result per answer, in the order of answers
+    """
+    workers = workers or os.cpu_count() or 1
+    # Build or refresh the matrix once here rather than racing in every worker
+    gaming.get_feedback_matrix(length)
+    size = -(-len(answers) // workers) if answers else 1
+    shards = [answers[start:start + size]
+              for start in range(0, len(answers), size)]
+    with ProcessPoolExecutor(workers, initializer=init_worker,
+                             initargs=(length,)) as pool:
+        results = pool.map(_play_all, [solver_name] * len(shards), shards)
+        return [result for shard in results for result in shard]
+
+def summarise(results: Sequence[Result]) -> tuple[tuple[int, ...], float]:
+    """ Returns the stats tuple (as shown by print_stats) and the mean number
+        of guesses over won games.
+    """
+    stats = [0] * (MAX_GUESSES + 1)
+    for _, guesses, won in results:
+        stats[len(guesses) - 1 if won else MAX_GUESSES] += 1
+    won_guesses = [len(guesses) for _, guesses, won in results if won]
+    mean = sum(won_guesses) / len(won_guesses) if won_guesses else 0.0
+    return tuple(stats), mean
+
+def write_csv(results: Sequence[Result], filename: str) -> None:
+    """ Writes one row per answer: answer, #guesses, won, the guesses made.
+    """
+    with open(filename, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(('answer', 'guesses', 'won', 'path'))
+        for answer, guesses, won in results:
+            writer.writerow((answer, len(guesses), int(won), ' '.join(guesses)))
+
+def check_length(parser: argparse.ArgumentParser, length: int) -> None:
+    """ Exits with a usage error unless there are word lists for --length.
+    """
+    if not 1 <= length <= MAX_WORD_LENGTH:
+        parser.error('--length must be from 1 to %d' % MAX_WORD_LENGTH)
+    for filename in (variant_file(VOCAB_FILE, length),
+                     variant_file(ANSWERS_FILE, length)):
+        if not os.path.exists(filename):
+            parser.error('no %d letter word list: %s is missing'
+                         % (length, filename))
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description='Play a solver against every answer without a player.')
+    parser.add_argument('--solver', choices=SOLVERS, default='best')
+    parser.add_argument('--length', type=int, default=WORD_LENGTH,
+                        help='number of letters in a word')
+    parser.add_argument('--sample', type=int,
+                        help='play a random sample of this many answers')
+    parser.add_argument('--seed', type=int, help='seed for --sample')
+    parser.add_argument('--workers', type=int,
+                        help='number of processes (default: CPU count)')
+    parser.add_argument('--csv', help='write per answer results to this file')
+    args = parser.parse_args(argv)
+    check_length(parser, args.length)
+
+    answers = list(gaming.get_word_lists(args.length)[1])
+    if args.sample is not None:
+        answers = Random(args.seed).sample(answers, min(args.sample,
+                                                        len(answers)))
+    start = time.perf_counter()
+    results = simulate(args.solver, answers, args.workers, args.length)
+    elapsed = time.perf_counter() - start
+
+    stats, mean = summarise(results)
+    gaming.print_stats(stats)
+    print('Mean guesses: %.3f' % mean)
+    print('Played %d games in %.2fs' % (len(results), elapsed),
+          file=sys.stderr)
+    if args.csv:
+        write_csv(results, args.csv)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+from __future__ import annotations
+import os
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from math import log2
+from operator import itemgetter
+from typing import Hashable, Optional, Sequence
+
+from feedback import (
+    FeedbackMatrix,
+    encode_pattern,
+    matrix_pool,
+    worker_matrix,
+)
+
+# Below this many matrix lookups a turn is scored in process; above it the
+# vocab is split across a process pool.
+POOL_THRESHOLD = 400_000
+CHUNKS_PER_WORKER = 4
+# Most past turns a solver remembers the choice for
+MEMO_SIZE = 10_000
+
+
+def remaining_answers(
+    matrix: FeedbackMatrix,
+    history: Sequence[tuple[str, str]]
+) -> list[int]:
+    """ Returns the answer columns whose feedback matches every entry in
+        history exactly.
+
+    Parameters:
+        matrix: The feedback matrix
+        history: (guess, processed guess) pairs, as built by update_history
+    """
+    remaining = range(len(matrix.get_answers()))
+    for guess, processed in history:
+        row = matrix.row(guess)
+        code = encode_pattern(processed)
+        remaining = [j for j in remaining if row[j] == code]
+    return list(remaining)
+
+def entropy(row: Sequence[int], remaining: Sequence[int]) -> float:
+    """ Returns the expected information (in bits) of a guess, given its row of
+        the feedback matrix and the answer columns still possible.
+    """
+    total = len(remaining)
+    codes = itemgetter(*remaining)(row) if total > 1 else (row[remaining[0]],)
+    spread = sum(count * log2(count) for count in Counter(codes).values())
+    return log2(total) - spread / total
+
+def best_in(
+    matrix: FeedbackMatrix,
+    rows: Sequence[int],
+    remaining: Sequence[int]
+) -> tuple[tuple[float, bool, int], int]:
+    """ Returns (score, row) of the best guess among rows.
+
+    Guesses are ranked by entropy, then by whether they could be the answer
+    (so a lucky guess can win outright), then by vocab order.
+    """
+    answers = matrix.get_answers()
+    possible = {answers[j] for j in remaining}
+    vocab = matrix.get_vocab()
+    best = None
+    for i in rows:
+        key = (round(entropy(matrix.row_at(i), remaining), 9),
+               vocab[i] in possible, -i)
+        if best is None or key > best[0]:
+            best = (key, i)
+    return best
+
+
+def _score_chunk(
+    rows: range,
+    remaining: Sequence[int]
+) -> tuple[tuple[float, bool, int], int]:
+    """ Pool task: best guess among one chunk of vocab rows. """
+    return best_in(worker_matrix(), rows, remaining)
+
+
+class Memo:
+    """ A solver's memo of the choices made on past turns, bounded by
+        dropping the least recently used entry.
+    """
+    def __init__(self, size: int = MEMO_SIZE) -> None:
+        """ Sets up an empty memo holding at most size entries. """
+        self._entries = OrderedDict()
+        self._size = size
+
+    def get(self, key: Hashable) -> Optional[object]:
+        """ Returns the entry for key, or None if there is none. """
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: object) -> None:
+        """ Stores value for key, dropping the oldest entry if full. """
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._size:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        """ Returns the number of entries held. """
+        return len(self._entries)
+
+
+class EntropySolver:
+    """ Picks the guess that maximises the expected information about the
+        answer, scored over the answers still consistent with the history.
+    """
+    def __init__(
+        self,
+        matrix: FeedbackMatrix,
+        filename: str,
+        workers: Optional[int] = None
+    ) -> None:
+        """ Sets up a solver over a feedback matrix.
+
+        Parameters:
+            matrix: The feedback matrix for the vocab and answers
+            filename: The path of the matrix file, opened by pool processes
+            workers: Size of the process pool (defaults to the CPU count)
+        """
+        self._matrix = matrix
+        self._filename = filename
+        self._workers = workers or os.cpu_count() or 1
+        self._pool = None
+        self._known = Memo()
+        self._rows = {}
+        self._vocab = None
+
+    def _rows_of(
+        self,
+        words: Sequence[str],
+        numbers: Sequence[int]
+    ) -> Sequence[int]:
+        """ Returns the matrix rows of the given words, by word number. """
+        if words is self._matrix.get_vocab():
+            return numbers
+        if self._vocab is None:
+            self._vocab = frozenset(self._matrix.get_vocab())
+        return [self._matrix.vocab_index(words[i]) for i in numbers
+                if words[i] in self._vocab]
+
+    def _rows_for(self, words: Sequence[str]) -> Sequence[int]:
+        """ Returns the matrix rows of the guessable words. """
+        cached = self._rows.get(id(words))
+        if cached is None or cached[0] is not words:
+            cached = (words, self._rows_of(words, range(len(words))))
+            self._rows[id(words)] = cached
+        return cached[1]
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """ Returns the process pool, starting it on first use. """
+        if self._pool is None:
+            self._pool = matrix_pool(self._matrix, self._filename,
+                                     self._workers)
+        return self._pool
+
+    def best_row(self, rows: Sequence[int], remaining: Sequence[int]) -> int:
+        """ Returns the best guess row among rows for the remaining answers.
+        """
+        if self._workers == 1 or len(rows) * len(remaining) < POOL_THRESHOLD:
+            return best_in(self._matrix, rows, remaining)[1]
+        chunks = self._workers * CHUNKS_PER_WORKER
+        size = -(-len(rows) // chunks)
+        pool = self._get_pool()
+        futures = [pool.submit(_score_chunk, rows[start:start + size],
+                               remaining)
+                   for start in range(0, len(rows), size)]
+        return max(future.result() for future in futures)[1]
+
+    def guess(
+        self,
+        words: Sequence[str],
+        history: Sequence[tuple[str, str]],
+        allowed: Optional[Sequence[int]] = None
+    ) -> Optional[str]:
+        """ Returns the most informative guess from words, or None if no
+            answer is consistent with history.
+
+        Parameters:
+            words: The guessable words, a list kept for the whole game
+            history: (guess, processed guess) pairs, as built by update_history
+            allowed: If given, the numbers of the only words that may be
+                     guessed (hard mode); these choices are not remembered,
+                     since the allowed words change with the history
+        """
+        remaining = remaining_answers(self._matrix, history)
+        answers = self._matrix.get_answers()
+        if len(remaining) <= 2:
+            return answers[remaining[0]] if remaining else None
+        if allowed is not None:
+            rows = self._rows_of(words, allowed)
+            if not rows:
+                return None
+            return self._matrix.get_vocab()[self.best_row(rows, remaining)]
+        # Games that reach the same answers left (every opening, and any two
+        # games with the same early feedback) get the same guess, so each
+        # set is only scored once
+        key = (id(words), tuple(remaining))
+        cached = self._known.get(key)
+        if cached is None or cached[0] is not words:
+            cached = (words, self.best_row(self._rows_for(words), remaining))
+            self._known.put(key, cached)
+        return self._matrix.get_vocab()[cached[1]]
+
+    def close(self) -> None:
+        """ Stops the process pool. """
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
@@ -0,0 +1,136 @@
+from __future__ import annotations
+import os
+from collections import OrderedDict
+from typing import Callable, Optional, Sequence
+
+from feedback import encode_pattern
+from support import word_checksum
+
+CACHE_SIZE = 100_000
+
+# The clues a history gives, independent of the order the guesses were made
+Signature = tuple[tuple[str, int], ...]
+
+
+def signature(history: Sequence[tuple[str, str]]) -> Signature:
+    """ Returns the canonical form of a history: each distinct (guess,
+        pattern code) pair once, sorted.
+
+    Histories with the same clues in a different order, or with a guess
+    repeated, get the same signature.
+    """
+    return tuple(sorted({(guess, encode_pattern(processed))
+                         for guess, processed in history}))
+
+
+class SolverCache:
+    """ A bounded least recently used cache in front of a solver.
+
+        Results are keyed by the signature of the history, so the solver
+        must depend only on the clues given, not on their order. guess_next
+        works that way: it filters by the history's summary.
+    """
+    def __init__(
+        self,
+        solver: Callable[[Sequence[str], Sequence[tuple[str, str]]],
+                         Optional[str]],
+        words: Sequence[str],
+        capacity: int = CACHE_SIZE,
+        filename: Optional[str] = None
+    ) -> None:
+        """ Sets up the cache, warming it from filename if it was saved for
+            the same words.
+
+        Parameters:
+            solver: A guess_next style function taking (words, history)
+            words: The guessable words passed to solver
+            capacity: Most results kept; the least recently used go first
+            filename: Where the cache is saved, None to keep it in memory
+        """
+        self._solver = solver
+        self._words = words
+        self._capacity = capacity
+        self._filename = filename
+        self._entries = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._load()
+
+    def guess(self, history: Sequence[tuple[str, str]]) -> Optional[str]:
+        """ Returns the solver's guess after history, calling the solver only
+            if no history with the same signature has been seen.
+        """
+        key = signature(history)
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return self._entries[key]
+        self._misses += 1
+        result = self._solver(self._words, history)
+        self._store(key, result)
+        return result
+
+    def _store(self, key: Signature, result: Optional[str]) -> None:
+        """ Adds an entry, evicting the least recently used if full. """
+        self._entries[key] = result
+        if len(self._entries) > self._capacity:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def _load(self) -> None:
+        """ Reads the saved entries, if they are for these words. Entries
+            are saved oldest first, so recency carries over.
+        """
+        if self._filename is None:
+            return
+        try:
+            with open(self._filename, 'r') as file:
+                header = file.readline().split()
+                if [int(value) for value in header] != [
+                        len(self._words), word_checksum(self._words)]:
+                    return
+                for line in file:
+                    result, *clues = line.split()
+                    key = tuple((guess, int(code)) for guess, code
+                                in (clue.split(':') for clue in clues))
+                    self._store(key, None if result == '-' else result)
+        except (OSError, ValueError):
+            self._entries.clear()
+            self._evictions = 0
+
+    def save(self) -> None:
+        """ Writes the entries to filename, if there is one. """
+        if self._filename is None:
+            return
+        temp_name = self._filename + '.tmp'
+        with open(temp_name, 'w') as file:
+            file.write('%d %d\n' % (len(self._words),
+                                    word_checksum(self._words)))
+            for key, result in self._entries.items():
+                file.write(' '.join([result or '-'] + ['%s:%d' % clue
+                                                       for clue in key]))
+                file.write('\n')
+        os.replace(temp_name, self._filename)
+
+    def get_hits(self) -> int:
+        """ Returns the number of lookups answered from the cache. """
+        return self._hits
+
+    def get_misses(self) -> int:
+        """ Returns the number of lookups passed on to the solver. """
+        return self._misses
+
+    def get_evictions(self) -> int:
+        """ Returns the number of entries dropped to stay within capacity. """
+        return self._evictions
+
+    def __len__(self) -> int:
+        """ Returns the number of cached results. """
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        """ Returns the computer representation of this cache. """
+        return (f"SolverCache({len(self)}/{self._capacity}, "
+                f"hits={self._hits}, misses={self._misses}, "
+                f"evictions={self._evictions})")
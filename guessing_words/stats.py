@@ -0,0 +1,116 @@
+from __future__ import annotations
+import os
+
+from support import STATS_FILE, STATS_LOG_FILE, MAX_GUESSES
+
+# Results are stored as their index into the stats tuple: 0-5 for a win in
+# 1-6 guesses, 6 for a loss (with the standard guess limit).
+RESULTS = MAX_GUESSES + 1
+COMPACT_EVERY = 1000
+
+
+class StatsStore:
+    """ Game results kept in an append-only log plus a compacted aggregate.
+
+        Every finished game appends one line to the log. Every COMPACT_EVERY
+        games the totals are written to the aggregate file along with how far
+        into the log they cover, and the log is emptied, so loading only ever
+        reads the aggregate and a bounded tail of the log.
+    """
+    def __init__(
+        self,
+        filename: str = STATS_FILE,
+        log_filename: str = STATS_LOG_FILE,
+        compact_every: int = COMPACT_EVERY,
+        results: int = RESULTS
+    ) -> None:
+        """ Loads the totals from the aggregate and the uncompacted log tail.
+
+        Parameters:
+            filename: The aggregate file
+            log_filename: The append-only log
+            compact_every: Number of logged games between compactions
+            results: Number of possible results (the guess limit + 1)
+        """
+        self._filename = filename
+        self._log_filename = log_filename
+        self._compact_every = compact_every
+        self._results = results
+        self._stats = [0] * results
+        self._pending = 0
+
+        offset = self._load_aggregate()
+        try:
+            size = os.path.getsize(log_filename)
+        except OSError:
+            size = 0
+        if size < offset:
+            # Stopped after emptying the log but before resetting the offset
+            offset = 0
+            self._write_aggregate(0)
+        if size > offset:
+            with open(log_filename, 'rb') as log:
+                log.seek(offset)
+                for line in log:
+                    try:
+                        result = int(line)
+                    except ValueError:
+                        continue  # a torn write or a blank line
+                    if 0 <= result < results:
+                        self._stats[result] += 1
+                        self._pending += 1
+
+    def _load_aggregate(self) -> int:
+        """ Reads the compacted totals, returning the log offset they cover.
+        """
+        try:
+            with open(self._filename, 'r') as file:
+                values = [int(value) for value in file.read().split()]
+        except (OSError, ValueError):
+            return 0
+        if len(values) != self._results + 1:
+            return 0
+        self._stats = values[:self._results]
+        return values[self._results]
+
+    def _write_aggregate(self, offset: int) -> None:
+        """ Atomically writes the totals and the log offset they cover. """
+        temp_name = self._filename + '.tmp'
+        with open(temp_name, 'w') as file:
+            file.write(' '.join(str(count) for count in self._stats))
+            file.write(' %d\n' % offset)
+        os.replace(temp_name, self._filename)
+
+    def record(self, result: int) -> None:
+        """ Logs one finished game.
+
+        Parameters:
+            result: Number of guesses - 1 for a win, the guess limit for a loss
+        """
+        with open(self._log_filename, 'a') as log:
+            log.write('%d\n' % result)
+        self._stats[result] += 1
+        self._pending += 1
+        if self._pending >= self._compact_every:
+            self.compact()
+
+    def compact(self) -> None:
+        """ Folds the log into the aggregate and empties the log. """
+        try:
+            size = os.path.getsize(self._log_filename)
+        except OSError:
+            size = 0
+        # The offset keeps the totals right if we stop before the log is
+        # emptied; once it is, the offset goes back to 0
+        self._write_aggregate(size)
+        open(self._log_filename, 'w').close()
+        self._write_aggregate(0)
+        self._pending = 0
+
+    def get_stats(self) -> tuple[int, ...]:
+        """ Returns the totals in the shape print_stats expects. """
+        return tuple(self._stats)
+
+    def __repr__(self) -> str:
+        """ Returns the computer representation of this store. """
+        return f"StatsStore({self._filename!r}, {self._log_filename!r})"
@@ -1,16 +1,34 @@
 from __future__ import annotations
+import os
+import zlib
 from random import choice, seed
+from typing import Callable, Optional, Sequence, TypeVar
+
+from word_store import WordStore
 
 VOCAB_FILE = "vocab.txt"
 ANSWERS_FILE = "answers.txt"
+FEEDBACK_FILE = "feedback.bin"
+DECISION_TREE_FILE = "tree.bin"
+DECK_FILE = "deck.txt"
+STATS_FILE = "stats.txt"
+STATS_LOG_FILE = "stats.log"
+SOLVER_CACHE_FILE = "solver_cache.txt"
+DIFFICULTY_FILE = "difficulty.bin"
 CORRECT = "🟩"
 MISPLACED = "🟨"
 INCORRECT = "⬛"
 UNSEEN = " "
+WORD_LENGTH = 6
+# Pattern codes (3**length of them) are stored as uint16
+MAX_WORD_LENGTH = 10
+MAX_GUESSES = 6
 
 # seed(1001.2022)
 
-def load_words(filename: str) -> tuple[str,...]:
+T = TypeVar('T')
+
+def load_words(filename: str) -> WordStore:
 	""" Loads all words from the file with the given name.
 
 	Parameters:
@@ -18,11 +36,42 @@ def load_words(filename: str) -> tuple[str,...]:
 						a separate line.
 
 	Returns:
-		tuple<str>: A tuple containing all the words in the file.
+		WordStore: A read only sequence of all the words in the file. The file
+				   is read the first time the words are used.
 	"""
-	with open(filename, 'r') as file:
-		words = [line.strip() for line in file.readlines()]
-	return tuple(words)
+	return WordStore(filename)
+
+def variant_file(filename: str, length: int = WORD_LENGTH,
+				 max_guesses: int = MAX_GUESSES, boards: int = 1,
+				 mode: Optional[str] = None) -> str:
+	""" Returns the file holding data for a game variant.
+
+	The standard game (6 letter words, 6 guesses, 1 board) uses filename
+	itself. Other variants add '_' and the mode, the word length, 'x' and the
+	guess limit, and 'b' and the number of boards, where they differ, before
+	the extension: vocab5.txt, stats7x8.txt, statsx9b4.txt,
+	stats_adversarial5.txt.
+
+	Parameters:
+		filename (str): The file used by the standard game.
+		length (int): Number of letters in a word.
+		max_guesses (int): Number of guesses allowed.
+		boards (int): Number of answers played at once.
+		mode (str): How the answers are chosen, if not at random.
+
+	Returns:
+		str: The file name for the variant.
+	"""
+	root, extension = os.path.splitext(filename)
+	if mode is not None:
+		root += '_' + mode
+	if length != WORD_LENGTH:
+		root += str(length)
+	if max_guesses != MAX_GUESSES:
+		root += 'x%d' % max_guesses
+	if boards != 1:
+		root += 'b%d' % boards
+	return root + extension
 
 def choose_word(words: tuple[str,...]) -> str:
 	""" Chooses a word at random from words.
@@ -36,3 +85,43 @@ def choose_word(words: tuple[str,...]) -> str:
 	return choice(words)
  
 
+def word_checksum(words: Sequence[str]) -> int:
+	""" Returns a checksum of a word list, stored in the header of files built
+	from it so a file left over from a different list is spotted.
+
+	Parameters:
+		words (Sequence<str>): The word list, in order.
+
+	Returns:
+		int: The crc32 of the words, one per line.
+	"""
+	return zlib.crc32('\n'.join(words).encode())
+
+def cached_for(cache: dict[int, T], words: Sequence[str],
+			   build: Callable[[Sequence[str]], T],
+			   load: Optional[Callable[[WordStore], T]] = None) -> T:
+	""" Returns the structure built over a word list, building it the first
+	time a given list is seen.
+
+	Entries are keyed by the list's id and remember the list (through their
+	get_words method), so a new list that reuses a freed id is not given a
+	stale structure.
+
+	Parameters:
+		cache (dict<int, T>): The module's cache of built structures.
+		words (Sequence<str>): The word list.
+		build (callable): Builds the structure over a word list.
+		load (callable): If given, used instead of build for a WordStore, to
+						 read the structure saved next to its file.
+
+	Returns:
+		T: The structure for words.
+	"""
+	cached = cache.get(id(words))
+	if cached is None or cached.get_words() is not words:
+		if load is not None and isinstance(words, WordStore):
+			cached = load(words)
+		else:
+			cached = build(words)
+		cache[id(words)] = cached
+	return cached
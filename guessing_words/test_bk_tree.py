@@ -0,0 +1,52 @@
+from __future__ import annotations
+import os
+from random import Random
+
+from bk_tree import BKTree, edit_distance, load_tree
+
+PAIRS = 3000
+
+
+def reference_distance(a: str, b: str) -> int:
+    """ Returns the Levenshtein distance from the full dynamic programming
+        table.
+    """
+    previous = list(range(len(b) + 1))
+    for i, x in enumerate(a, 1):
+        current = [i]
+        for j, y in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1,
+                               previous[j - 1] + (x != y)))
+        previous = current
+    return previous[-1]
+
+
+def test_edit_distance_matches_reference(vocab):
+    rng = Random(4)
+    words = vocab + ['', 'a', 'ab', 'ba', 'abcdefgh']
+    for _ in range(PAIRS):
+        a, b = rng.choice(words), rng.choice(words)
+        assert edit_distance(a, b) == reference_distance(a, b), (a, b)
+
+def test_within_matches_brute_force(vocab):
+    tree = BKTree(vocab)
+    for word in ['crane', 'stared', 'hunted', 'qqqqqq', vocab[10]]:
+        for radius in (1, 2):
+            assert sorted(match for _, match in tree.within(word, radius)) \
+                == sorted(other for other in vocab
+                          if reference_distance(word, other) <= radius)
+
+def test_tree_round_trip(tmp_path, vocab):
+    filename = str(tmp_path / 'vocab.bkt')
+    built = load_tree(vocab, filename)
+    assert os.path.exists(filename)
+    loaded = load_tree(vocab, filename)
+    for word in ['crane', 'stared', vocab[20]]:
+        assert loaded.within(word, 2) == built.within(word, 2)
+        assert loaded.suggest(word) == built.suggest(word)
+
+def test_stale_tree_is_rebuilt(tmp_path, vocab):
+    filename = str(tmp_path / 'vocab.bkt')
+    load_tree(vocab[:100], filename)
+    tree = load_tree(vocab, filename)
+    assert tree.within(vocab[-1], 0) == [(0, vocab[-1])]
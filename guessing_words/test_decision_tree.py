@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from decision_tree import OpeningBook, build_node, load_book, save_tree
+from feedback import decode_pattern, load_feedback_matrix, score_pattern
+
+ANSWERS = 40
+
+
+def play(book: OpeningBook, answer: str) -> list[str]:
+    """ Returns the guesses the book makes against answer. """
+    history = []
+    while True:
+        guess = book.next_guess(history)
+        history.append((guess, decode_pattern(score_pattern(guess, answer))))
+        if guess == answer or len(history) > 10:
+            return [guess for guess, _ in history]
+
+
+def test_tree_round_trip(tmp_path, vocab, answers):
+    answers = answers[:ANSWERS]
+    matrix = load_feedback_matrix(vocab, answers,
+                                  str(tmp_path / 'feedback.bin'))
+    root = build_node(matrix, list(range(len(answers))))
+    filename = str(tmp_path / 'tree.bin')
+    save_tree(root, vocab, answers, filename)
+    built = OpeningBook(root, vocab)
+    loaded = load_book(vocab, answers, filename)
+    for answer in answers:
+        guesses = play(loaded, answer)
+        assert guesses == play(built, answer)
+        assert guesses[-1] == answer
+    matrix.close()
+
+def test_stale_tree_is_ignored(tmp_path, vocab, answers):
+    filename = str(tmp_path / 'tree.bin')
+    assert load_book(vocab, answers, filename) is None
+    save_tree((0, {}), vocab, answers[1:], filename)
+    assert load_book(vocab, answers, filename) is None
+    assert load_book(vocab, answers[1:], filename) is not None
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from deck import AnswerDeck
+
+
+def test_second_deck_resumes_without_repeats(tmp_path, answers):
+    filename = str(tmp_path / 'deck.txt')
+    first = AnswerDeck(answers, filename, seed=7)
+    dealt = [first.draw() for _ in range(100)]
+    second = AnswerDeck(answers, filename)
+    assert second.remaining() == len(answers) - 100
+    dealt += [second.draw() for _ in range(len(answers) - 100)]
+    assert sorted(dealt) == sorted(answers)
+    # A used up deck is reshuffled, not repeated
+    assert second.remaining() == 0
+    again = [second.draw() for _ in range(len(answers))]
+    assert sorted(again) == sorted(answers) and again != dealt
+
+def test_changed_word_list_starts_a_fresh_deck(tmp_path, answers):
+    filename = str(tmp_path / 'deck.txt')
+    first = AnswerDeck(answers, filename, seed=7)
+    for _ in range(100):
+        first.draw()
+    # Same length, so only the checksum tells the lists apart
+    words = answers[1:] + answers[:1]
+    deck = AnswerDeck(words, filename, seed=7)
+    assert deck.remaining() == len(words)
+    assert sorted(deck.draw() for _ in range(len(words))) == sorted(words)
@@ -0,0 +1,33 @@
+from __future__ import annotations
+from random import Random
+
+from difficulty import TIERS, DifficultyTable, load_table
+
+
+def random_table(count: int) -> DifficultyTable:
+    """ Returns a table of seeded random scores with plenty of ties. """
+    rng = Random(5)
+    return DifficultyTable([rng.randint(2, 4) for _ in range(count)],
+                           [rng.randint(0, 3) for _ in range(count)])
+
+
+def test_tiers_split_at_score_changes(answers):
+    table = random_table(len(answers))
+    tiers = [table.get_tier(name) for name in TIERS]
+    assert sorted(i for tier in tiers for i in tier) == \
+        list(range(len(answers)))
+    for easier, harder in zip(tiers, tiers[1:]):
+        assert max(map(table.get_score, easier)) < \
+            min(map(table.get_score, harder))
+    for tier in tiers:
+        assert abs(len(tier) - len(answers) / len(TIERS)) < len(answers) / 6
+
+def test_table_round_trip(tmp_path, answers):
+    filename = str(tmp_path / 'difficulty.bin')
+    table = random_table(len(answers))
+    table.save(answers, filename)
+    loaded = load_table(answers, filename)
+    assert [loaded.get_score(i) for i in range(len(answers))] == \
+        [table.get_score(i) for i in range(len(answers))]
+    assert load_table(answers[1:], filename) is None
+    assert load_table(answers, str(tmp_path / 'missing.bin')) is None
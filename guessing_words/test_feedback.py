@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from feedback import (
+    build_feedback_matrix,
+    decode_pattern,
+    encode_pattern,
+    load_feedback_matrix,
+    score_against_all,
+    score_many,
+    score_pattern,
+)
+from reference import reference_score
+
+
+def test_score_pattern_matches_reference(vocab, answers):
+    for guess in vocab[::4]:
+        for answer in answers:
+            assert score_pattern(guess, answer) == \
+                reference_score(guess, answer), (guess, answer)
+
+def test_score_pattern_repeated_letters():
+    # Two Es in the answer, both green: the other Es are grey
+    assert score_pattern('eeeeee', 'better') == encode_pattern('⬛🟩⬛⬛🟩⬛')
+    # One L and one E in the answer: the green L and the first E take them
+    assert score_pattern('allele', 'plates') == encode_pattern('🟨🟩⬛🟨⬛⬛')
+
+def test_pattern_round_trip():
+    for code in range(3 ** 6):
+        assert encode_pattern(decode_pattern(code)) == code
+
+def test_batch_scoring(vocab, answers):
+    assert list(score_many(vocab[:50], answers[0])) == \
+        [score_pattern(guess, answers[0]) for guess in vocab[:50]]
+    assert list(score_against_all(vocab[0], answers)) == \
+        [score_pattern(vocab[0], answer) for answer in answers]
+
+def test_matrix_round_trip(tmp_path, vocab, answers):
+    filename = str(tmp_path / 'feedback.bin')
+    matrix = load_feedback_matrix(vocab, answers, filename)
+    for guess in vocab[::37]:
+        for answer in answers[::11]:
+            assert matrix.code(guess, answer) == score_pattern(guess, answer)
+    j = matrix.answer_index(answers[5])
+    assert list(matrix.column_at(j)) == \
+        [score_pattern(guess, answers[5]) for guess in vocab]
+    matrix.close()
+
+def test_matrix_incremental_rebuild(tmp_path, vocab, answers):
+    grown = str(tmp_path / 'grown.bin')
+    fresh = str(tmp_path / 'fresh.bin')
+    build_feedback_matrix(vocab[:300], answers[:100], grown)
+    load_feedback_matrix(vocab, answers, grown).close()
+    build_feedback_matrix(vocab, answers, fresh)
+    with open(grown, 'rb') as file, open(fresh, 'rb') as other:
+        assert file.read() == other.read()
+
+def test_stale_matrix_is_rebuilt(tmp_path, vocab, answers):
+    filename = str(tmp_path / 'feedback.bin')
+    build_feedback_matrix(vocab, answers[1:], filename)
+    # Not a prefix of the words it was built for, so nothing is reused
+    matrix = load_feedback_matrix(vocab, answers, filename)
+    assert list(matrix.column_at(0)) == \
+        [score_pattern(guess, answers[0]) for guess in vocab]
+    matrix.close()
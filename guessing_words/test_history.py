@@ -0,0 +1,24 @@
+from __future__ import annotations
+from random import Random
+
+from history import GuessHistory
+from reference import fits, random_history
+
+GAMES = 150
+
+
+def test_check_hard_matches_replay(vocab, answers):
+    rng = Random(2)
+    for _ in range(GAMES):
+        history = random_history(rng, vocab, answers)
+        for word in vocab[::3]:
+            assert (history.check_hard(word) is None) == fits(history, word), \
+                (list(history), word)
+
+def test_check_hard_reasons():
+    history = GuessHistory([('stared', '⬛🟨⬛⬛🟩🟩')])
+    assert history.check_hard('hunted') is None
+    assert history.check_hard('hunter') == '6th letter must be D'
+    assert history.check_hard('etched') == '2nd letter cannot be T'
+    assert history.check_hard('bonked') == 'Guess must contain T'
+    assert history.check_hard('busted') == 'Guess cannot contain S'
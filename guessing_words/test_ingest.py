@@ -0,0 +1,43 @@
+from __future__ import annotations
+import gzip
+import os
+from random import Random
+
+from ingest import dedupe, ingest, keep
+from word_store import WordStore
+
+WORDS = 2000
+
+
+def test_dedupe_merges_run_files(tmp_path, vocab):
+    rng = Random(7)
+    words = [rng.choice(vocab[:300]) for _ in range(WORDS)]
+    # Small runs, so every word is repeated across several run files
+    assert list(dedupe(words, 97, str(tmp_path))) == sorted(set(words))
+    assert os.listdir(tmp_path) == []
+    assert list(dedupe(words, WORDS + 1, str(tmp_path))) == sorted(set(words))
+
+def test_dedupe_removes_runs_when_stopped_early(tmp_path, vocab):
+    words = dedupe(vocab[::-1], 50, str(tmp_path))
+    assert next(words) == vocab[0]
+    assert os.listdir(tmp_path) != []
+    words.close()
+    assert os.listdir(tmp_path) == []
+
+def test_keep():
+    words = ['hunted', 'hunt', 'hunters', 'hun-ed', 'h3nted', 'crème',
+             'cafés', 'hello']
+    assert list(keep(words, 6)) == ['hunted']
+    assert list(keep(words, 5)) == ['hello']
+    assert list(keep(words, 5, 'abcdefghijklmnopqrstuvwxyzèé')) == \
+        ['crème', 'cafés', 'hello']
+
+def test_ingest(tmp_path, vocab):
+    source = tmp_path / 'words.txt.gz'
+    lines = [word.upper() + '  ' for word in vocab] + ['abc', 'don\'t'] * 3
+    with gzip.open(source, 'wt') as file:
+        file.write('\n'.join(lines + vocab[:20]) + '\n')
+    target = str(tmp_path / 'vocab.txt')
+    assert ingest([str(source)], target, run_size=100) == \
+        (len(lines) + 20, len(vocab))
+    assert list(WordStore(target)) == vocab
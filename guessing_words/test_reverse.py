@@ -0,0 +1,38 @@
+from __future__ import annotations
+from random import Random
+
+from feedback import encode_pattern, load_feedback_matrix, score_pattern
+from reverse import ReverseIndex, parse_row
+
+ANSWERS = 60
+GRIDS = 40
+
+
+def test_parse_row():
+    assert parse_row('⬛🟨⬛⬛🟩🟩\n') == (encode_pattern('⬛🟨⬛⬛🟩🟩'), 6)
+    # Light theme and high contrast squares
+    assert parse_row('⬜🟦⬜⬜🟧🟧') == (encode_pattern('⬛🟨⬛⬛🟩🟩'), 6)
+    # A 5 square row is not a 6 square row with a grey first square
+    assert parse_row('🟩🟩🟩🟩🟩') == (encode_pattern('🟩🟩🟩🟩🟩'), 5)
+    assert parse_row('Wordle 1 3/6') is None
+    assert parse_row('\n') is None
+
+def test_answers_for_matches_brute_force(tmp_path, vocab, answers):
+    answers = answers[:ANSWERS]
+    matrix = load_feedback_matrix(vocab, answers,
+                                  str(tmp_path / 'feedback.bin'))
+    index = ReverseIndex(matrix)
+    codes_for = {answer: {score_pattern(guess, answer) for guess in vocab}
+                 for answer in answers}
+    rng = Random(6)
+    for _ in range(GRIDS):
+        answer = rng.choice(answers)
+        guesses = rng.sample(vocab, rng.randint(1, 4))
+        codes = [score_pattern(guess, answer) for guess in guesses]
+        found = index.answers_for(codes)
+        assert found == [other for other in answers
+                         if codes_for[other].issuperset(codes)]
+        assert answer in found
+        for guess, code in zip(index.guesses_for(answer, codes), codes):
+            assert score_pattern(guess, answer) == code
+    matrix.close()
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import gaming
+from deck import AnswerDeck
+from server import GameSession
+from solver_cache import SolverCache
+from support import MAX_GUESSES
+
+
+def session_for(answer: str, hard: bool = False) -> GameSession:
+    """ Returns a session whose every game has answer, with the solver stood
+        in by one that always suggests answer.
+    """
+    hints = SolverCache(lambda words, history: answer, gaming.available_vocab)
+    return GameSession(AnswerDeck([answer], None), hints, hard)
+
+def test_won_then_ready(answers):
+    answer = answers[0]
+    session = session_for(answer)
+    assert session.handle('a\n') == (['SUGGEST %s' % answer], False)
+    replies, done = session.handle(answer.upper() + '\n')
+    assert replies[1:] == ['WON 1', 'READY'] and not done
+    # A new game has started
+    assert len(session.get_history()) == 0
+    assert session.handle('q') == (['BYE'], True)
+
+def test_lost_then_ready(answers):
+    answer, other = answers[0], answers[1]
+    session = session_for(answer)
+    for _ in range(MAX_GUESSES - 1):
+        replies, _ = session.handle(other)
+        assert replies == [session.get_history()[-1][1]]
+    replies, done = session.handle(other)
+    assert replies[1:] == ['LOST %s' % answer, 'READY'] and not done
+    assert len(session.get_history()) == 0
+
+def test_invalid_guesses(answers):
+    answer = answers[0]
+    session = session_for(answer, hard=True)
+    assert session.handle(answer[:-1])[0][0].startswith('INVALID')
+    assert session.handle('z' * len(answer)) == (['INVALID Unknown word'],
+                                                 False)
+    session.handle(answers[1])
+    history = session.get_history()
+    breaking = next(word for word in gaming.available_vocab
+                    if history.check_hard(word) is not None)
+    assert session.handle(breaking) == \
+        (['INVALID %s' % history.check_hard(breaking)], False)
+    # Rejected guesses don't use up a turn
+    assert len(history) == 1
+
+def test_completions(answers):
+    answer = answers[0]
+    prefix = answer[:-1]
+    replies, done = session_for(answer).handle('?' + prefix.upper())
+    words = replies[0].split()
+    assert words[0] == 'COMPLETE' and answer in words[1:] and not done
+    assert all(word.startswith(prefix) and word in gaming.available_vocab
+               for word in words[1:])
+    # In hard mode only guesses fitting the feedback are offered
+    session = session_for(answer, hard=True)
+    session.handle(answers[1])
+    history = session.get_history()
+    words = session.handle('?' + prefix)[0][0].split()[1:]
+    assert answer in words
+    assert all(history.check_hard(word) is None for word in words)
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from solver_cache import SolverCache, signature
+
+CLUES = [('stared', '⬛🟨⬛⬛🟩🟩'), ('hunted', '⬛⬛⬛🟩🟩🟩'),
+         ('bolted', '⬛⬛⬛🟩🟩🟩'), ('potted', '⬛⬛🟩🟩🟩🟩')]
+
+
+class CountingSolver:
+    """ A stand-in solver that guesses the last word of the history and
+        counts its calls.
+    """
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __call__(self, words, history):
+        self.calls += 1
+        return history[-1][0] if history else None
+
+
+def test_signature_ignores_order_and_repeats():
+    assert signature(CLUES) == signature(CLUES[::-1])
+    assert signature(CLUES) == signature(CLUES + CLUES[:2])
+    assert signature(CLUES) != signature(CLUES[:3])
+
+def test_lru_eviction_and_counters(vocab):
+    solver = CountingSolver()
+    cache = SolverCache(solver, vocab, capacity=2)
+    first, second, third = CLUES[:1], CLUES[:2], CLUES[:3]
+    cache.guess(first)
+    cache.guess(second)
+    assert cache.guess(first) == 'stared'  # a hit; second is now the oldest
+    cache.guess(third)  # evicts second
+    assert len(cache) == 2
+    assert (cache.get_hits(), cache.get_misses(), cache.get_evictions()) == \
+        (1, 3, 1)
+    cache.guess(first)
+    cache.guess(second)
+    assert solver.calls == 4
+    assert (cache.get_hits(), cache.get_misses(), cache.get_evictions()) == \
+        (2, 4, 2)
+
+def test_save_and_load(tmp_path, vocab):
+    filename = str(tmp_path / 'cache.txt')
+    cache = SolverCache(CountingSolver(), vocab, filename=filename)
+    cache.guess(CLUES[:2])
+    cache.guess([])
+    cache.save()
+    solver = CountingSolver()
+    loaded = SolverCache(solver, vocab, filename=filename)
+    assert len(loaded) == 2
+    assert loaded.guess(CLUES[1::-1]) == 'hunted'
+    assert loaded.guess([]) is None
+    assert solver.calls == 0
+    # Saved for other words, so the cache starts empty
+    stale = SolverCache(CountingSolver(), vocab[1:], filename=filename)
+    assert len(stale) == 0
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from stats import RESULTS, StatsStore
+
+
+def open_store(tmp_path, compact_every: int = 5) -> StatsStore:
+    """ Returns a store kept in tmp_path. """
+    return StatsStore(str(tmp_path / 'stats.txt'), str(tmp_path / 'stats.log'),
+                      compact_every)
+
+def totals(results: list[int]) -> tuple[int, ...]:
+    """ Returns the stats tuple for the given game results. """
+    return tuple(results.count(result) for result in range(RESULTS))
+
+
+def test_append_and_reload(tmp_path):
+    store = open_store(tmp_path)
+    for result in (0, 3, 3, 6):
+        store.record(result)
+    assert store.get_stats() == totals([0, 3, 3, 6])
+    assert open_store(tmp_path).get_stats() == totals([0, 3, 3, 6])
+
+def test_compact_and_reload(tmp_path):
+    results = [1, 2, 2, 4, 6, 0, 3]
+    store = open_store(tmp_path)
+    for result in results:
+        store.record(result)
+    # The fifth game compacted the log; two games were logged after it
+    assert (tmp_path / 'stats.log').read_text() == '0\n3\n'
+    assert open_store(tmp_path).get_stats() == totals(results)
+    store.compact()
+    assert (tmp_path / 'stats.log').read_text() == ''
+    assert open_store(tmp_path).get_stats() == totals(results)
+
+def test_torn_log_lines_are_skipped(tmp_path):
+    (tmp_path / 'stats.log').write_bytes(b'2\n\n5\n4\x00\x00')
+    assert open_store(tmp_path).get_stats() == totals([2, 5])
+
+def test_log_emptied_before_offset_reset(tmp_path):
+    # Stopped between emptying the log and resetting its offset, then one
+    # more game was played
+    (tmp_path / 'stats.txt').write_text('1 0 3 0 0 0 2 40\n')
+    (tmp_path / 'stats.log').write_text('4\n')
+    store = open_store(tmp_path)
+    assert store.get_stats() == (1, 0, 3, 0, 1, 0, 2)
+    assert (tmp_path / 'stats.txt').read_text() == '1 0 3 0 0 0 2 0\n'
+    assert open_store(tmp_path).get_stats() == (1, 0, 3, 0, 1, 0, 2)
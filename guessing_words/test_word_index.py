@@ -0,0 +1,57 @@
+from __future__ import annotations
+import os
+from random import Random
+
+from reference import fits, random_history
+from word_index import WordIndex, load_index
+
+GAMES = 100
+
+
+def test_masks_match_brute_force(vocab):
+    index = WordIndex(vocab)
+    for position in range(6):
+        for letter in 'aeisz':
+            assert index.words_in(index.with_letter_at(position, letter)) == \
+                [word for word in vocab if word[position] == letter]
+    for count in (1, 2, 3):
+        assert index.words_in(index.with_at_least('e', count)) == \
+            [word for word in vocab if word.count('e') >= count]
+
+def test_compile_matches_replay(vocab, answers):
+    index = WordIndex(vocab)
+    rng = Random(3)
+    for _ in range(GAMES):
+        history = random_history(rng, vocab, answers)
+        assert index.words_in(index.compile(history)) == \
+            [word for word in vocab if fits(history, word)], list(history)
+
+def test_numbers_in(vocab):
+    index = WordIndex(vocab)
+    mask = index.with_letter_at(0, 'c')
+    numbers = index.numbers_in(mask)
+    assert [vocab[i] for i in numbers] == index.words_in(mask)
+    assert numbers == [i for i, word in enumerate(vocab) if word[0] == 'c']
+
+def test_index_round_trip(tmp_path, vocab):
+    filename = str(tmp_path / 'vocab.idx')
+    built = load_index(vocab, filename)
+    assert os.path.exists(filename)
+    loaded = load_index(vocab, filename)
+    for position in range(6):
+        for letter in 'aeisz':
+            assert loaded.with_letter_at(position, letter) == \
+                built.with_letter_at(position, letter)
+    for count in (1, 2, 3):
+        assert loaded.with_at_least('e', count) == \
+            built.with_at_least('e', count)
+
+def test_stale_index_is_rebuilt(tmp_path, vocab):
+    filename = str(tmp_path / 'vocab.idx')
+    load_index(vocab[1:], filename)
+    index = load_index(vocab, filename)
+    assert index.words_in(index.with_letter_at(0, vocab[0][0]))[0] == vocab[0]
+    with open(filename, 'r+b') as file:
+        file.write(b'XXXX')
+    index = load_index(vocab, filename)
+    assert index.words_in(index.all_words()) == vocab
@@ -0,0 +1,59 @@
+from __future__ import annotations
+import os
+
+import pytest
+
+from word_store import WordStore, compiled_name, write_compiled
+
+
+def write_words(path, words: list[str]) -> str:
+    """ Writes words one per line to path, returning its name. """
+    path.write_text(''.join(word + '\n' for word in words), encoding='utf-8')
+    return str(path)
+
+
+def test_store_round_trip(tmp_path, vocab):
+    words = vocab[::-1]
+    filename = write_words(tmp_path / 'words.txt', words)
+    store = WordStore(filename)
+    assert list(store) == words
+    assert os.path.exists(compiled_name(filename))
+    # A second store maps the compiled file as it is
+    store = WordStore(filename)
+    assert len(store) == len(words)
+    assert store[0] == words[0] and store[-1] == words[-1]
+    assert store[3:6] == tuple(words[3:6])
+    assert all(word in store for word in words[::7])
+    assert 'zzzzzz' not in store and 'abc' not in store
+    assert store.with_prefix('ca') == \
+        sorted(word for word in words if word.startswith('ca'))
+    assert [words[i] for i in store.get_order()] == sorted(words)
+
+def test_stale_store_is_recompiled(tmp_path, vocab):
+    filename = write_words(tmp_path / 'words.txt', vocab[:50])
+    assert len(WordStore(filename)) == 50
+    write_words(tmp_path / 'words.txt', vocab[:60])
+    os.utime(filename, ns=(1, 1))
+    assert list(WordStore(filename)) == vocab[:60]
+
+def test_corrupt_store_is_recompiled(tmp_path, vocab):
+    filename = write_words(tmp_path / 'words.txt', vocab[:50])
+    assert len(WordStore(filename)) == 50
+    with open(compiled_name(filename), 'r+b') as file:
+        file.seek(70)
+        file.write(b'\xff\xff')
+    assert list(WordStore(filename)) == vocab[:50]
+
+def test_non_ascii_words(tmp_path):
+    words = ['cafés', 'crème', 'hello']
+    filename = write_words(tmp_path / 'words.txt', words)
+    store = WordStore(filename)
+    assert list(store) == words
+    assert 'crème' in store and 'creme' not in store
+    assert store.with_prefix('c') == ['cafés', 'crème']
+
+def test_write_compiled_rejects_long_words(tmp_path):
+    target = str(tmp_path / 'words.bin')
+    with pytest.raises(ValueError):
+        write_compiled(['cafés'], 5, target)
+    assert os.listdir(tmp_path) == []
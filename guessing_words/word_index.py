@@ -0,0 +1,204 @@
+from __future__ import annotations
+import os
+import struct
+from typing import Optional, Sequence
+
+from history import GuessHistory
+from support import cached_for, word_checksum
+
+INDEX_SUFFIX = '.idx'
+MAGIC = b'WIDX'
+FORMAT_VERSION = 1
+# magic, version, #words, checksum of the words
+HEADER = struct.Struct('<4sHII')
+# letter (code point), kind (POSITION or COUNT), position or count; followed
+# by the mask in little endian bytes
+ENTRY = struct.Struct('<IBB')
+POSITION = 0
+COUNT = 1
+
+
+def _mask(indices: list[int], size: int) -> int:
+    """ Returns an integer with exactly the given bits set. """
+    digits = bytearray(b'0') * size
+    for i in indices:
+        digits[size - 1 - i] = ord('1')
+    return int(digits, 2) if size else 0
+
+
+class WordIndex:
+    """ Bitset index over a fixed list of words.
+
+        Bit i of every mask stands for words[i]. Masks are plain Python ints,
+        so filtering a whole word list is a handful of AND / AND NOT
+        operations instead of a loop over every word.
+    """
+    def __init__(
+        self,
+        words: Sequence[str],
+        masks: Optional[tuple[list[dict[str, int]],
+                              dict[tuple[str, int], int]]] = None
+    ) -> None:
+        """ Builds the positional and letter count bitsets for words.
+
+        Parameters:
+            words: The words to index, all of the same length
+            masks: Previously built (positions, counts) masks for words, as
+                   read by load_index
+        """
+        self._words = words
+        self._size = len(words)
+        self._length = len(words[0]) if self._size else 0
+        self._all = (1 << self._size) - 1
+        if masks is not None:
+            self._positions, self._counts = masks
+            return
+
+        positions = [{} for _ in range(self._length)]
+        counts = {}
+        for i, word in enumerate(words):
+            seen = {}
+            for position, letter in enumerate(word):
+                positions[position].setdefault(letter, []).append(i)
+                seen[letter] = seen.get(letter, 0) + 1
+            for letter, count in seen.items():
+                for at_least in range(1, count + 1):
+                    counts.setdefault((letter, at_least), []).append(i)
+
+        # _positions[i][letter]: words with letter at position i
+        self._positions = [
+            {letter: _mask(indices, self._size)
+             for letter, indices in letters.items()}
+            for letters in positions
+        ]
+        # _counts[(letter, k)]: words containing letter at least k times
+        self._counts = {key: _mask(indices, self._size)
+                        for key, indices in counts.items()}
+
+    def save(self, filename: str) -> None:
+        """ Writes the masks to filename so load_index can skip building. """
+        width = (self._size + 7) // 8
+        temp_name = filename + '.tmp'
+        with open(temp_name, 'wb') as file:
+            file.write(HEADER.pack(MAGIC, FORMAT_VERSION, self._size,
+                                   word_checksum(self._words)))
+            for position, letters in enumerate(self._positions):
+                for letter, mask in letters.items():
+                    file.write(ENTRY.pack(ord(letter), POSITION, position))
+                    file.write(mask.to_bytes(width, 'little'))
+            for (letter, count), mask in self._counts.items():
+                file.write(ENTRY.pack(ord(letter), COUNT, count))
+                file.write(mask.to_bytes(width, 'little'))
+        os.replace(temp_name, filename)
+
+    def get_words(self) -> Sequence[str]:
+        """ Returns the words this index was built over. """
+        return self._words
+
+    def all_words(self) -> int:
+        """ Returns the mask containing every word. """
+        return self._all
+
+    def with_letter_at(self, position: int, letter: str) -> int:
+        """ Returns the mask of words with letter at the given position. """
+        return self._positions[position].get(letter, 0)
+
+    def with_at_least(self, letter: str, count: int) -> int:
+        """ Returns the mask of words containing letter at least count times.
+        """
+        if count <= 0:
+            return self._all
+        return self._counts.get((letter, count), 0)
+
+    def compile(self, history: GuessHistory) -> int:
+        """ Returns the mask of words consistent with the summary of history.
+
+        Reads only the folded summary: fixed green letters, letters banned
+        from each position and the min / max count of each letter, so the cost
+        does not grow with the number of guesses.
+        """
+        mask = self._all
+        for i, letter in enumerate(history.get_greens()):
+            if letter is not None:
+                mask &= self.with_letter_at(i, letter)
+        for i, letters in enumerate(history.get_banned()):
+            for letter in letters:
+                mask &= ~self.with_letter_at(i, letter)
+        for letter, count in history.get_min_counts().items():
+            mask &= self.with_at_least(letter, count)
+        for letter, count in history.get_max_counts().items():
+            mask &= ~self.with_at_least(letter, count + 1)
+        return mask
+
+    def first(self, mask: int) -> Optional[str]:
+        """ Returns the earliest word in mask, or None if mask is empty. """
+        if not mask:
+            return None
+        return self._words[(mask & -mask).bit_length() - 1]
+
+    def numbers_in(self, mask: int) -> list[int]:
+        """ Returns the word numbers in mask, in increasing order. """
+        bits = bin(mask)[:1:-1]
+        found = []
+        i = bits.find('1')
+        while i != -1:
+            found.append(i)
+            i = bits.find('1', i + 1)
+        return found
+
+    def words_in(self, mask: int) -> list[str]:
+        """ Returns the words in mask, in word list order. """
+        return [self._words[i] for i in self.numbers_in(mask)]
+
+    def __len__(self) -> int:
+        """ Returns the number of indexed words. """
+        return self._size
+
+    def __repr__(self) -> str:
+        """ Returns the computer representation of this index. """
+        return f"WordIndex({self._size} words)"
+
+
+def index_name(filename: str) -> str:
+    """ Returns the saved index path for a text word list. """
+    return os.path.splitext(filename)[0] + INDEX_SUFFIX
+
+def load_index(words: Sequence[str], filename: str) -> WordIndex:
+    """ Returns the index for words, read from filename if it was saved for
+        the same words, or else built and saved there.
+    """
+    try:
+        with open(filename, 'rb') as file:
+            data = file.read()
+    except OSError:
+        data = b''
+    if len(data) >= HEADER.size and HEADER.unpack_from(data) == (
+            MAGIC, FORMAT_VERSION, len(words), word_checksum(words)):
+        width = (len(words) + 7) // 8
+        positions = [{} for _ in range(len(words[0]) if words else 0)]
+        counts = {}
+        offset = HEADER.size
+        while offset < len(data):
+            letter, kind, n = ENTRY.unpack_from(data, offset)
+            offset += ENTRY.size
+            mask = int.from_bytes(data[offset:offset + width], 'little')
+            offset += width
+            if kind == POSITION:
+                positions[n][chr(letter)] = mask
+            else:
+                counts[(chr(letter), n)] = mask
+        return WordIndex(words, (positions, counts))
+    index = WordIndex(words)
+    index.save(filename)
+    return index
+
+
+_indices = {}
+
+def get_index(words: Sequence[str]) -> WordIndex:
+    """ Returns the index for words, building it the first time a given word
+        list is seen. The index of a WordStore is also saved next to its file,
+        so later runs read it instead of building it.
+    """
+    return cached_for(_indices, words, WordIndex, lambda store: load_index(
+        store, index_name(store.get_filename())))
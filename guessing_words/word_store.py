@@ -0,0 +1,321 @@
+from __future__ import annotations
+import argparse
+import mmap
+import os
+import struct
+import zlib
+from array import array
+from bisect import bisect_left
+from collections.abc import Sequence
+from typing import Iterable, Iterator, Optional
+
+COMPILED_SUFFIX = '.bin'
+MAGIC = b'WDCT'
+FORMAT_VERSION = 1
+# magic, version, word length, #words, checksum of the records, hash table
+# slots, size and modification time of the text file it was compiled from
+HEADER = struct.Struct('<4sHHIIIQq')
+HEADER_SIZE = 64
+
+
+def compiled_name(filename: str) -> str:
+    """ Returns the compiled dictionary path for a text word list. """
+    return os.path.splitext(filename)[0] + COMPILED_SUFFIX
+
+def _aligned(size: int) -> int:
+    """ Rounds size up to a multiple of 4 so uint32 sections stay aligned. """
+    return -(-size // 4) * 4
+
+def _slot(word: bytes, mask: int) -> int:
+    """ Returns the first hash table slot to probe for word. """
+    return zlib.crc32(word) & mask
+
+def _table_size(count: int) -> int:
+    """ Returns a power of two at least twice count, so probes stay short. """
+    size = 1
+    while size < 2 * count:
+        size *= 2
+    return size
+
+def write_compiled(
+    words: Iterable[str],
+    width: int,
+    target: str,
+    source_size: int = 0,
+    source_mtime: int = 0,
+    ordered: bool = False
+) -> int:
+    """ Writes a compiled dictionary, streaming the words straight to disk.
+
+    Layout after the header: the words as fixed width NUL padded records in
+    the given order (padded to a multiple of 4 bytes), then the record numbers
+    in alphabetical order (uint32), then an open addressing hash table of
+    record number + 1 (uint32, 0 for an empty slot).
+
+    Parameters:
+        words: The words, none longer than width once UTF-8 encoded
+        width: The record width in bytes
+        target: The path to write
+        source_size: Size of the text file the words came from
+        source_mtime: Modification time (ns) of the text file
+        ordered: The words are already in alphabetical order, so the
+                 order section needn't be sorted
+
+    Returns:
+        The number of words written
+
+    Raises:
+        ValueError: If a word does not fit in a record
+    """
+    temp_name = target + '.tmp'
+    with open(temp_name, 'w+b') as file:
+        file.write(b'\0' * HEADER_SIZE)
+        checksum = 0
+        count = 0
+        for word in words:
+            record = word.encode()
+            if len(record) > width:
+                file.close()
+                os.remove(temp_name)
+                raise ValueError('%r is longer than %d bytes' % (word, width))
+            record = record.ljust(width, b'\0')
+            checksum = zlib.crc32(record, checksum)
+            file.write(record)
+            count += 1
+        file.write(b'\0' * (_aligned(count * width) - count * width))
+        file.flush()
+
+        order = array('I', range(count))
+        table = array('I', bytes(4 * _table_size(count)))
+        if count:
+            # Sort and hash the records where they were written, reading
+            # them through the page cache rather than copying them
+            end = HEADER_SIZE + count * width
+            with mmap.mmap(file.fileno(), 0) as view, \
+                    memoryview(view)[HEADER_SIZE:end] as records:
+                keys = _Records(records, width)
+                if not ordered:
+                    order = array('I', sorted(order, key=keys.__getitem__))
+                mask = len(table) - 1
+                for i in range(count):
+                    slot = _slot(keys[i], mask)
+                    while table[slot]:
+                        slot = (slot + 1) & mask
+                    table[slot] = i + 1
+
+        file.write(order.tobytes())
+        file.write(table.tobytes())
+        file.seek(0)
+        file.write(HEADER.pack(MAGIC, FORMAT_VERSION, width, count, checksum,
+                               len(table), source_size, source_mtime))
+    os.replace(temp_name, target)
+    return count
+
+def compile_words(filename: str, target: Optional[str] = None) -> str:
+    """ Compiles a text word list (one word per line) into a dictionary file.
+
+    Parameters:
+        filename: The text word list
+        target: Where to write, defaults to compiled_name(filename)
+
+    Returns:
+        The path written
+    """
+    target = target or compiled_name(filename)
+    stat = os.stat(filename)
+    with open(filename, 'r') as file:
+        width = max((len(line.strip().encode()) for line in file),
+                    default=0)
+    with open(filename, 'r') as file:
+        write_compiled((line.strip() for line in file), width, target,
+                       stat.st_size, stat.st_mtime_ns)
+    return target
+
+
+class _Records(Sequence):
+    """ Fixed width records in a buffer, optionally read through an order
+        (used to bisect the alphabetical order).
+    """
+    def __init__(
+        self,
+        buffer: bytes,
+        width: int,
+        order: Optional[Sequence[int]] = None
+    ) -> None:
+        self._buffer = buffer
+        self._width = width
+        self._order = order
+
+    def __len__(self) -> int:
+        if self._order is not None:
+            return len(self._order)
+        return len(self._buffer) // self._width if self._width else 0
+
+    def __getitem__(self, index: int) -> bytes:
+        if self._order is not None:
+            index = self._order[index]
+        start = index * self._width
+        return bytes(self._buffer[start:start + self._width])
+
+
+class WordStore(Sequence):
+    """ A read only word list backed by a memory mapped compiled dictionary.
+
+        Behaves like the tuple load_words used to return (same order, same
+        indexing) but only decodes the words that are asked for. Membership is
+        a hash table probe and prefix queries bisect the alphabetical order
+        stored in the file.
+
+        The text file stays the source of truth: the compiled file is (re)built
+        the first time the store is used if it is missing or older than the
+        text.
+    """
+    def __init__(self, filename: str) -> None:
+        """ Sets up a store for the words in filename without reading it.
+
+        Parameters:
+            filename: The name of the file to load from. Each word must be on
+                      a separate line.
+        """
+        self._filename = filename
+        self._compiled = compiled_name(filename)
+        self._map = None
+
+    def _open(self) -> Optional[mmap.mmap]:
+        """ Maps the compiled file if it is current, returning None if not. """
+        try:
+            file = open(self._compiled, 'rb')
+        except OSError:
+            return None
+        with file:
+            raw = file.read(HEADER.size)
+            if len(raw) != HEADER.size:
+                return None
+            (magic, version, width, count, checksum, slots, size,
+             mtime) = HEADER.unpack(raw)
+            if magic != MAGIC or version != FORMAT_VERSION:
+                return None
+            try:
+                stat = os.stat(self._filename)
+            except OSError:
+                stat = None  # Only the compiled file was shipped
+            if stat and (stat.st_size, stat.st_mtime_ns) != (size, mtime):
+                return None
+            view = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if zlib.crc32(view[HEADER_SIZE:HEADER_SIZE + count * width]) \
+                != checksum:
+            view.close()
+            return None
+        return view
+
+    def _load(self) -> None:
+        """ Maps the compiled dictionary, building it first if needed. """
+        if self._map is not None:
+            return
+        view = self._open()
+        if view is None:
+            compile_words(self._filename, self._compiled)
+            view = self._open()
+        if view is None:
+            raise ValueError('%s does not match %s after compiling it'
+                             % (self._compiled, self._filename))
+        _, _, width, count, _, slots, _, _ = HEADER.unpack_from(view)
+        self._width = width
+        self._count = count
+        records = memoryview(view)[HEADER_SIZE:HEADER_SIZE + count * width]
+        start = HEADER_SIZE + _aligned(count * width)
+        order = memoryview(view)[start:start + 4 * count].cast('I')
+        self._table = memoryview(view)[start + 4 * count:
+                                       start + 4 * (count + slots)].cast('I')
+        self._records = _Records(records, width)
+        self._sorted = _Records(records, width, order)
+        self._map = view
+
+    def get_filename(self) -> str:
+        """ Returns the text file this store reads from. """
+        return self._filename
+
+    def get_order(self) -> Sequence[int]:
+        """ Returns the word numbers in alphabetical order, as stored in the
+            compiled file.
+        """
+        self._load()
+        return self._sorted._order
+
+    def _decode(self, i: int) -> str:
+        """ Returns record i as a str. """
+        return self._records[i].rstrip(b'\0').decode()
+
+    def with_prefix(self, prefix: str) -> list[str]:
+        """ Returns the words starting with prefix, in alphabetical order. """
+        self._load()
+        key = prefix.encode()
+        start = bisect_left(self._sorted, key)
+        end = bisect_left(self._sorted, key + b'\xff', start)
+        found = [self._sorted[i].rstrip(b'\0').decode()
+                 for i in range(start, end)]
+        # Drop repeated lines, which sit next to each other
+        return [word for i, word in enumerate(found)
+                if i == 0 or word != found[i - 1]]
+
+    def __contains__(self, word: object) -> bool:
+        """ Returns True iff word is in the store, in O(1). """
+        self._load()
+        if not isinstance(word, str) or not self._count:
+            return False
+        record = word.encode()
+        if len(record) > self._width:
+            return False
+        record = record.ljust(self._width, b'\0')
+        mask = len(self._table) - 1
+        slot = _slot(record, mask)
+        while self._table[slot]:
+            if self._records[self._table[slot] - 1] == record:
+                return True
+            slot = (slot + 1) & mask
+        return False
+
+    def __len__(self) -> int:
+        """ Returns the number of words, counting repeats. """
+        self._load()
+        return self._count
+
+    def __getitem__(self, index):
+        """ Returns the word(s) at index, in file order. """
+        self._load()
+        if isinstance(index, slice):
+            return tuple(self._decode(i)
+                         for i in range(*index.indices(self._count)))
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError('word index out of range')
+        return self._decode(index)
+
+    def __iter__(self) -> Iterator[str]:
+        """ Iterates over the words in file order. """
+        self._load()
+        return (self._decode(i) for i in range(self._count))
+
+    def __repr__(self) -> str:
+        """ Returns the computer representation of this store. """
+        return f"WordStore({self._filename!r})"
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description='Manage compiled word dictionaries.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    compile_parser = commands.add_parser(
+        'compile', help='compile text word lists into dictionary files')
+    compile_parser.add_argument('files', nargs='+')
+    args = parser.parse_args(argv)
+
+    for filename in args.files:
+        target = compile_words(filename)
+        print('Compiled', filename, '->', target,
+              '(%d words)' % len(WordStore(filename)))
+
+
+if __name__ == "__main__":
+    main()